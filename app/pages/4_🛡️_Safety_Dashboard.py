@@ -9,6 +9,7 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import json
 import random
 
 st.set_page_config(page_title="Safety Dashboard", page_icon="🛡️", layout="wide")
@@ -105,14 +106,22 @@ def init_safety_session_state():
         st.session_state.notify_slack = False
     if 'notify_dashboard' not in st.session_state:
         st.session_state.notify_dashboard = True
+    if 'data_version' not in st.session_state:
+        st.session_state.data_version = 0
     if 'safety_score_history' not in st.session_state:
         st.session_state.safety_score_history = generate_safety_score_history()
+    if 'safety_score_stats' not in st.session_state:
+        st.session_state.safety_score_stats = compute_safety_score_stats(st.session_state.safety_score_history)
     if 'violation_log' not in st.session_state:
         st.session_state.violation_log = generate_violation_log()
+    if 'violation_counts' not in st.session_state:
+        st.session_state.violation_counts = compute_violation_counts(st.session_state.violation_log)
     if 'intervention_log' not in st.session_state:
         st.session_state.intervention_log = generate_intervention_log()
     if 'agent_compliance' not in st.session_state:
         st.session_state.agent_compliance = generate_agent_compliance()
+    if 'agent_rates' not in st.session_state:
+        st.session_state.agent_names, st.session_state.agent_rates = compliance_arrays(st.session_state.agent_compliance)
     if 'constitutional_principles' not in st.session_state:
         st.session_state.constitutional_principles = generate_constitutional_principles()
 
@@ -135,6 +144,16 @@ def generate_safety_score_history():
     return {"dates": [d.strftime("%Y-%m-%d") for d in dates], "scores": scores}
 
 
+def compute_safety_score_stats(history):
+    """Summarize a safety score history into the scalars shown on the trends tab."""
+    scores = history["scores"]
+    return {
+        "mean": float(np.mean(scores)),
+        "min": float(np.min(scores)),
+        "last": float(scores[-1]),
+    }
+
+
 def generate_violation_log():
     """Generate sample constitutional violation records."""
     return [
@@ -211,6 +230,21 @@ def generate_violation_log():
     ]
 
 
+def compute_violation_counts(log):
+    """Tally the violation log once for the metric and summary cards."""
+    counts = {"today": 0, "critical": 0, "blocked": 0, "resolved": 0}
+    for v in log:
+        if "2024-02-07" in v["timestamp"]:
+            counts["today"] += 1
+        if v["severity"] == "Critical":
+            counts["critical"] += 1
+        if v["status"] == "Blocked":
+            counts["blocked"] += 1
+        elif v["status"] == "Resolved":
+            counts["resolved"] += 1
+    return counts
+
+
 def generate_intervention_log():
     """Generate sample human intervention records."""
     return [
@@ -370,6 +404,13 @@ def generate_agent_compliance():
     }
 
 
+def compliance_arrays(compliance):
+    """Flatten per-agent compliance data into parallel name and rate arrays."""
+    names = np.array(list(compliance.keys()))
+    rates = np.fromiter((data["compliance_rate"] for data in compliance.values()), dtype=np.float64, count=len(compliance))
+    return names, rates
+
+
 def generate_constitutional_principles():
     """Generate the master list of constitutional principles across agents."""
     return [
@@ -390,6 +431,18 @@ def generate_constitutional_principles():
     ]
 
 
+def build_safety_report(safety_mode, current_score, violations, interventions, agent_compliance):
+    """Assemble the exportable safety report."""
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "safety_mode": safety_mode,
+        "current_score": current_score,
+        "violations": violations,
+        "interventions": interventions,
+        "agent_compliance": {k: dict(v) for k, v in agent_compliance.items()},
+    }
+
+
 # ---------------------------------------------------------------------------
 # Chart builders
 # ---------------------------------------------------------------------------
@@ -575,6 +628,21 @@ def build_disagreement_heatmap():
     return fig, matrix, agents
 
 
+# Cached wrappers are keyed on ``data_version`` (bumped on refresh) rather than
+# on the logs themselves, so Streamlit only has to hash a single int.
+
+@st.cache_data(show_spinner=False)
+def cached_violations_chart(data_version):
+    """Cached violations-by-category chart for the given data version."""
+    return build_violations_by_category(st.session_state.violation_log)
+
+
+@st.cache_data(show_spinner=False)
+def cached_disagreement_heatmap(data_version):
+    """Cached agent agreement heatmap for the given data version."""
+    return build_disagreement_heatmap()
+
+
 # ---------------------------------------------------------------------------
 # Main page
 # ---------------------------------------------------------------------------
@@ -587,14 +655,14 @@ def main():
     st.markdown("Real-time safety monitoring, constitutional compliance, and intervention tracking for the CoHumAIn multi-agent system.")
 
     # Compute current aggregate safety score
-    current_score = st.session_state.safety_score_history["scores"][-1]
+    current_score = st.session_state.safety_score_stats["last"]
 
     # Top metrics row
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         total_violations = len(st.session_state.violation_log)
-        recent_violations = sum(1 for v in st.session_state.violation_log if "2024-02-07" in v["timestamp"])
+        recent_violations = st.session_state.violation_counts["today"]
         st.metric("Total Violations", total_violations, delta=f"+{recent_violations} today", delta_color="inverse")
 
     with col2:
@@ -602,8 +670,9 @@ def main():
         st.metric("Interventions (7 days)", total_interventions, delta="-2 vs last week")
 
     with col3:
-        compliant_agents = sum(1 for a in st.session_state.agent_compliance.values() if a["compliance_rate"] >= 0.95)
-        total_agents = len(st.session_state.agent_compliance)
+        rates = st.session_state.agent_rates
+        compliant_agents = int(np.count_nonzero(rates >= 0.95))
+        total_agents = rates.size
         st.metric("Compliant Agents", f"{compliant_agents}/{total_agents}", delta="All within tolerance")
 
     with col4:
@@ -729,7 +798,7 @@ def show_safety_overview(current_score):
     st.markdown("#### Safety Summary")
     s1, s2, s3 = st.columns(3)
     with s1:
-        critical_count = sum(1 for v in st.session_state.violation_log if v["severity"] == "Critical")
+        critical_count = st.session_state.violation_counts["critical"]
         st.markdown(f"""
         <div class="safety-card-critical">
             <div style="font-weight:600;">Critical Violations</div>
@@ -738,7 +807,7 @@ def show_safety_overview(current_score):
         </div>
         """, unsafe_allow_html=True)
     with s2:
-        blocked_count = sum(1 for v in st.session_state.violation_log if v["status"] == "Blocked")
+        blocked_count = st.session_state.violation_counts["blocked"]
         st.markdown(f"""
         <div class="safety-card-warning">
             <div style="font-weight:600;">Outputs Blocked</div>
@@ -747,7 +816,7 @@ def show_safety_overview(current_score):
         </div>
         """, unsafe_allow_html=True)
     with s3:
-        resolved_count = sum(1 for v in st.session_state.violation_log if v["status"] == "Resolved")
+        resolved_count = st.session_state.violation_counts["resolved"]
         st.markdown(f"""
         <div class="safety-card-safe">
             <div style="font-weight:600;">Resolved Issues</div>
@@ -815,21 +884,14 @@ def show_constitutional_monitor():
     # Per-agent compliance rate bars
     st.markdown("#### Compliance Rate by Agent")
 
-    agent_names = list(st.session_state.agent_compliance.keys())
-    rates = [st.session_state.agent_compliance[a]["compliance_rate"] for a in agent_names]
+    agent_names = st.session_state.agent_names
+    rates = st.session_state.agent_rates
 
-    colors = []
-    for r in rates:
-        if r >= 0.98:
-            colors.append("#10b981")
-        elif r >= 0.95:
-            colors.append("#f59e0b")
-        else:
-            colors.append("#ef4444")
+    colors = np.where(rates >= 0.98, "#10b981", np.where(rates >= 0.95, "#f59e0b", "#ef4444"))
 
     fig = go.Figure(data=[go.Bar(
         x=agent_names,
-        y=[r * 100 for r in rates],
+        y=rates * 100,
         marker_color=colors,
         text=[f"{r:.1%}" for r in rates],
         textposition="outside",
@@ -851,7 +913,7 @@ def show_misalignment_detection():
 
     with col_heat:
         st.markdown("#### Pairwise Agent Agreement Heatmap")
-        fig, matrix, agents = build_disagreement_heatmap()
+        fig, matrix, agents = cached_disagreement_heatmap(st.session_state.data_version)
         st.plotly_chart(fig, use_container_width=True)
 
         st.caption(
@@ -1035,7 +1097,7 @@ def show_safety_trends():
 
     with col1:
         st.markdown("#### Violations by Category")
-        fig_bar = build_violations_by_category(st.session_state.violation_log)
+        fig_bar = cached_violations_chart(st.session_state.data_version)
         st.plotly_chart(fig_bar, use_container_width=True)
 
     with col2:
@@ -1047,12 +1109,13 @@ def show_safety_trends():
 
     # Row 3: Additional trend metrics
     st.markdown("#### Key Trend Indicators")
+    stats = st.session_state.safety_score_stats
     m1, m2, m3, m4 = st.columns(4)
 
     with m1:
-        st.metric("Avg Safety Score (30d)", f"{np.mean(st.session_state.safety_score_history['scores']):.1%}", delta="+1.2%")
+        st.metric("Avg Safety Score (30d)", f"{stats['mean']:.1%}", delta="+1.2%")
     with m2:
-        st.metric("Min Safety Score (30d)", f"{np.min(st.session_state.safety_score_history['scores']):.1%}", delta_color="inverse")
+        st.metric("Min Safety Score (30d)", f"{stats['min']:.1%}", delta_color="inverse")
     with m3:
         st.metric("Mean Intervention Duration", "18.9 min", delta="-3.1 min")
     with m4:
@@ -1141,7 +1204,7 @@ def show_sidebar():
 
     # Quick stats
     st.markdown("### Quick Stats")
-    current_score = st.session_state.safety_score_history["scores"][-1]
+    current_score = st.session_state.safety_score_stats["last"]
     st.metric("Current Safety Score", f"{current_score:.1%}")
     st.metric("Active Principles", len(st.session_state.constitutional_principles))
     st.metric("Agents Monitored", len(st.session_state.agent_compliance))
@@ -1153,27 +1216,30 @@ def show_sidebar():
 
     if st.button("Refresh Safety Data", use_container_width=True):
         st.session_state.safety_score_history = generate_safety_score_history()
+        st.session_state.safety_score_stats = compute_safety_score_stats(st.session_state.safety_score_history)
         st.session_state.violation_log = generate_violation_log()
+        st.session_state.violation_counts = compute_violation_counts(st.session_state.violation_log)
         st.session_state.intervention_log = generate_intervention_log()
         st.session_state.agent_compliance = generate_agent_compliance()
+        st.session_state.agent_names, st.session_state.agent_rates = compliance_arrays(st.session_state.agent_compliance)
+        st.session_state.data_version += 1
         st.success("Safety data refreshed.")
         st.rerun()
 
     if st.button("Export Safety Report", use_container_width=True):
-        report = {
-            "generated_at": datetime.now().isoformat(),
-            "safety_mode": st.session_state.safety_mode,
-            "current_score": current_score,
-            "violations": st.session_state.violation_log,
-            "interventions": st.session_state.intervention_log,
-            "agent_compliance": {k: {kk: vv for kk, vv in v.items()} for k, v in st.session_state.agent_compliance.items()},
-        }
-        import json
+        report = build_safety_report(
+            st.session_state.safety_mode,
+            current_score,
+            st.session_state.violation_log,
+            st.session_state.intervention_log,
+            st.session_state.agent_compliance,
+        )
         st.download_button(
             "Download Report (JSON)",
-            json.dumps(report, indent=2, default=str),
+            data=json.dumps(report, indent=2, default=str),
             file_name="cohumain_safety_report.json",
             mime="application/json",
+            use_container_width=True,
         )
 
     st.divider()
@@ -10,6 +10,7 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 import json
+import string
 from datetime import datetime, timedelta
 
 st.set_page_config(page_title="Trust Calibration", page_icon="⚖️", layout="wide")
@@ -91,9 +92,68 @@ AGENT_COLORS = {
     "Test Generator": "#f59e0b",
 }
 
+# Display-only charts skip Plotly.js interaction handlers entirely; charts
+# where hover is useful keep it but drop the mode bar.
+STATIC_CHART_CONFIG = {"staticPlot": True, "displayModeBar": False, "responsive": False}
+HOVER_CHART_CONFIG = {"displayModeBar": False}
+
+# Shared layout fragments, allocated once instead of on every figure build.
+ZERO_MARGIN = dict(l=0, r=0, t=10, b=0)
+GAUGE_MARGIN = dict(l=30, r=30, t=60, b=10)
+HLEGEND_BOTTOM = dict(orientation="h", yanchor="bottom", y=-0.25)
+AXIS_UNIT = dict(range=[0, 1])
+AXIS_TRUST_PCT = dict(range=[60, 100])
+AXIS_ACCURACY_PCT = dict(range=[40, 105])
+AXIS_CONTRIBUTION_PCT = dict(title="Contribution (%)", range=[0, 100])
+AXIS_HIDDEN = dict(visible=False)
+
+# HTML card templates. Cards are rendered by substitution and joined so each
+# group of cards goes out as a single markdown element.
+_TRUST_CARD_TPL = string.Template(
+    '<div class="$card_class" style="flex:1;">'
+    '<div style="font-size:0.8rem;color:#6b7280;">$agent</div>'
+    '<div class="$status_class" style="font-size:1.75rem;">$trust</div>'
+    '<div style="font-size:0.75rem;color:#9ca3af;">Expertise $expertise</div>'
+    '</div>'
+)
+_METRIC_TPL = string.Template(
+    '<div class="metric-card" style="border-left-color:$color;">'
+    '<div style="font-size:0.8rem;color:#6b7280;">$label</div>'
+    '<div style="font-size:$size;font-weight:bold;color:$value_color;">$value</div>'
+    '</div>'
+)
+_FACTOR_TPL = string.Template(
+    '<div class="metric-card" style="padding:0.75rem 1rem;">'
+    '<div style="display:flex;justify-content:space-between;align-items:center;">'
+    '<span style="font-size:0.85rem;">$label</span>$badge'
+    '</div>'
+    '<div style="font-size:1.1rem;font-weight:bold;">$value</div>'
+    '</div>'
+)
+_REC_TPL = string.Template(
+    '<div class="rec-card" style="border-left-color:$color;">'
+    '<div style="display:flex;justify-content:space-between;align-items:center;">'
+    '<span style="font-weight:bold;font-size:1rem;">$title</span>'
+    '<span style="font-size:0.75rem;padding:2px 8px;border-radius:4px;'
+    'background:${color}20;color:$color;font-weight:600;">$priority</span>'
+    '</div>'
+    '<div style="font-size:0.875rem;color:#4b5563;margin-top:0.5rem;">$detail</div>'
+    '</div>'
+)
+_AGENT_REC_TPL = string.Template(
+    '<div class="metric-card" style="border-left-color:$color;">'
+    '<div style="font-weight:bold;color:$color;margin-bottom:6px;">$agent</div>'
+    '<div style="font-size:0.8rem;color:#6b7280;margin-bottom:4px;">'
+    'Trust $trust &nbsp;|&nbsp; Accuracy $accuracy &nbsp;|&nbsp; Bias $bias'
+    '</div>'
+    '<ul style="font-size:0.85rem;color:#374151;padding-left:1.25rem;margin:0;">$items</ul>'
+    '</div>'
+)
+
 np.random.seed(42)
 
 
+@st.cache_data(show_spinner=False)
 def _generate_calibration_data(n_bins=10, bias=0.0):
     """Return (predicted_bins, actual_accuracy) with optional bias."""
     bins = np.linspace(0.05, 0.95, n_bins)
@@ -102,6 +162,7 @@ def _generate_calibration_data(n_bins=10, bias=0.0):
     return bins, actual
 
 
+@st.cache_data(show_spinner=False)
 def _compute_ece(predicted, actual, n_bins=10):
     """Expected Calibration Error."""
     return float(np.mean(np.abs(np.array(predicted) - np.array(actual))))
@@ -149,6 +210,15 @@ def _generate_task_log(n=20):
     return tasks
 
 
+@st.cache_data(show_spinner=False)
+def _log_df(task_log):
+    """Task log as a DataFrame plus per-agent and overall accuracy."""
+    df = pd.DataFrame(task_log)
+    agent_accuracy = df.groupby("agent")["actual_correct"].mean().to_dict()
+    overall_accuracy = float(df["actual_correct"].to_numpy().mean())
+    return df, agent_accuracy, overall_accuracy
+
+
 def init_trust_state():
     """Populate session state with sample trust data."""
     if "trust_initialized" not in st.session_state:
@@ -185,6 +255,250 @@ def init_trust_state():
 
 init_trust_state()
 
+# Calibration curves and ECE are shared by the curve, automation and
+# recommendation tabs, so compute them once per rerun.
+cal_cache = {}
+for _agent in AGENT_NAMES:
+    _bins, _actual = _generate_calibration_data(
+        n_bins=10, bias=st.session_state.agent_trust[_agent]["calibration_bias"]
+    )
+    cal_cache[_agent] = (_bins, _actual, _compute_ece(_bins, _actual))
+sys_bins, sys_actual = _generate_calibration_data(n_bins=10, bias=0.005)
+sys_ece = _compute_ece(sys_bins, sys_actual)
+
+task_log_df, agent_acc_map, overall_accuracy = _log_df(st.session_state.task_log)
+
+
+# ---------------------------------------------------------------------------
+# Figure builders
+# Figures are cached on their (hashable) inputs, so reruns that do not change
+# what a chart shows reuse the existing figure object.
+# ---------------------------------------------------------------------------
+@st.cache_resource(max_entries=32)
+def build_gauge_fig(overall, reference, threshold, color):
+    """Overall trust gauge."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=overall * 100,
+        number={"suffix": "%", "font": {"size": 48}},
+        delta={"reference": reference * 100,
+               "suffix": "%", "relative": False},
+        gauge={
+            "axis": {"range": [0, 100], "tickwidth": 1},
+            "bar": {"color": color},
+            "bgcolor": "#f0f2f6",
+            "steps": [
+                {"range": [0, 70], "color": "#fef2f2"},
+                {"range": [70, 85], "color": "#fffbeb"},
+                {"range": [85, 100], "color": "#ecfdf5"},
+            ],
+            "threshold": {
+                "line": {"color": "#764ba2", "width": 3},
+                "thickness": 0.8,
+                "value": threshold * 100,
+            },
+        },
+        title={"text": "Overall System Trust", "font": {"size": 16}},
+    ))
+    fig.update_layout(height=300, margin=GAUGE_MARGIN, uirevision="constant")
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_trend_fig(dates, scores, threshold):
+    """Trust score trend line with the confidence threshold."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=dates, y=np.asarray(scores) * 100.0,
+        mode="lines+markers",
+        line=dict(color="#667eea", width=3),
+        marker=dict(size=5),
+        fill="tozeroy",
+        fillcolor="rgba(102,126,234,0.10)",
+        name="Trust Score",
+    ))
+    fig.add_hline(
+        y=threshold * 100,
+        line_dash="dash", line_color="#764ba2", line_width=2,
+        annotation_text=f"Threshold ({threshold:.0%})",
+        annotation_position="top left",
+    )
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Trust Score (%)",
+        yaxis=AXIS_TRUST_PCT,
+        height=300,
+        margin=ZERO_MARGIN,
+        uirevision="constant",
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_calibration_fig(agent_biases):
+    """Calibration curves for ``(agent, bias)`` pairs plus the system aggregate."""
+    fig = go.Figure()
+
+    # Perfect calibration line
+    fig.add_trace(go.Scatter(
+        x=[0, 1], y=[0, 1],
+        mode="lines",
+        line=dict(color="#9ca3af", dash="dash", width=2),
+        name="Perfect Calibration",
+    ))
+
+    for agent, bias in agent_biases:
+        bins, actual = _generate_calibration_data(n_bins=10, bias=bias)
+        fig.add_trace(go.Scatter(
+            x=bins, y=actual,
+            mode="lines+markers",
+            line=dict(color=AGENT_COLORS[agent], width=3),
+            marker=dict(size=8),
+            name=agent,
+        ))
+
+    # System aggregate
+    sys_bins, sys_actual = _generate_calibration_data(n_bins=10, bias=0.005)
+    fig.add_trace(go.Scatter(
+        x=sys_bins, y=sys_actual,
+        mode="lines+markers",
+        line=dict(color="#764ba2", width=4, dash="dot"),
+        marker=dict(size=10, symbol="diamond"),
+        name="System Aggregate",
+    ))
+
+    fig.update_layout(
+        xaxis_title="Predicted Confidence",
+        yaxis_title="Actual Accuracy",
+        xaxis=AXIS_UNIT,
+        yaxis=AXIS_UNIT,
+        height=480,
+        margin=ZERO_MARGIN,
+        legend=HLEGEND_BOTTOM,
+        uirevision="calibration_curve",
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_vote_fig(confs, weights):
+    """Stacked bar of each agent's share of the weighted vote."""
+    confs = np.asarray(confs)
+    weights = np.asarray(weights)
+    contributions = weights * confs
+    pct = contributions / contributions.sum() * 100
+
+    # One trace with explicit base offsets renders the whole stack.
+    fig = go.Figure(data=[go.Bar(
+        y=["Collective"] * len(AGENT_NAMES),
+        x=pct,
+        base=np.concatenate([[0.0], np.cumsum(pct)[:-1]]),
+        orientation="h",
+        marker_color=[AGENT_COLORS[a] for a in AGENT_NAMES],
+        text=[f"{p:.1f}%" for p in pct],
+        textposition="inside",
+        customdata=list(zip(AGENT_NAMES, confs.tolist(), weights.tolist())),
+        hovertemplate=(
+            "%{customdata[0]}<br>"
+            "Confidence: %{customdata[1]:.0%}<br>"
+            "Weight: %{customdata[2]:.2f}<br>"
+            "Contribution: %{x:.1f}%<extra></extra>"
+        ),
+    )])
+
+    fig.update_layout(
+        height=120,
+        margin=ZERO_MARGIN,
+        xaxis=AXIS_CONTRIBUTION_PCT,
+        yaxis=AXIS_HIDDEN,
+        showlegend=False,
+        transition_duration=0,
+        uirevision="constant",
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_comparison_fig(confs, weights):
+    """Grouped bars of raw vs weighted agent confidence."""
+    confs = np.asarray(confs)
+    weights = np.asarray(weights)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=AGENT_NAMES, y=confs,
+        name="Raw Confidence",
+        marker_color="rgba(102,126,234,0.45)",
+    ))
+    fig.add_trace(go.Bar(
+        x=AGENT_NAMES, y=weights * confs / weights.max(),
+        name="Weighted Confidence",
+        marker_color="rgba(118,75,162,0.75)",
+    ))
+    fig.update_layout(
+        barmode="group",
+        yaxis_title="Score",
+        height=320,
+        margin=ZERO_MARGIN,
+        legend=HLEGEND_BOTTOM,
+        uirevision="constant",
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_accuracy_fig(rolling_acc, threshold, overall):
+    """Rolling accuracy over the task sequence against threshold and overall accuracy."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.arange(len(rolling_acc), dtype=np.int32),
+        y=np.asarray(rolling_acc) * 100,
+        mode="lines+markers",
+        line=dict(color="#667eea", width=3),
+        marker=dict(size=6),
+        fill="tozeroy",
+        fillcolor="rgba(102,126,234,0.08)",
+        name="Rolling Accuracy (w=5)",
+    ))
+    fig.add_hline(
+        y=threshold * 100,
+        line_dash="dash", line_color="#764ba2",
+        annotation_text="Threshold",
+    )
+    fig.add_hline(
+        y=overall * 100,
+        line_dash="dot", line_color="#10b981",
+        annotation_text=f"Overall ({overall:.0%})",
+        annotation_position="bottom right",
+    )
+    fig.update_layout(
+        xaxis_title="Task Sequence",
+        yaxis_title="Accuracy (%)",
+        yaxis=AXIS_ACCURACY_PCT,
+        height=300,
+        margin=ZERO_MARGIN,
+        uirevision="constant",
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_bias_fig(well_calibrated, overconfident, underconfident):
+    """Donut of well-calibrated vs over/under-confident predictions."""
+    fig = go.Figure(data=[go.Pie(
+        labels=["Well-Calibrated", "Over-confident", "Under-confident"],
+        values=[well_calibrated, overconfident, underconfident],
+        hole=0.45,
+        marker=dict(colors=["#10b981", "#ef4444", "#f59e0b"]),
+        textinfo="label+value",
+    )])
+    fig.update_layout(
+        height=300,
+        margin=ZERO_MARGIN,
+        uirevision="constant",
+    )
+    return fig
+
+
 # ---------------------------------------------------------------------------
 # Sidebar
 # ---------------------------------------------------------------------------
@@ -247,22 +561,13 @@ st.markdown(
     "transparent confidence assessment and automation level recommendations."
 )
 
-# =========================================================================
-# TAB LAYOUT
-# =========================================================================
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-    "Overview",
-    "Calibration Curves",
-    "Automation Level",
-    "Collective Confidence",
-    "Historical Performance",
-    "Recommendations",
-])
 
 # =========================================================================
 # TAB 1 -- Trust Score Overview
 # =========================================================================
-with tab1:
+@st.fragment
+def _render_tab1():
+    """Tab 1: overall trust gauge, per-agent trust cards and trust trend."""
     st.subheader("Trust Score Overview")
 
     # --- Large gauge for overall trust ---
@@ -272,37 +577,19 @@ with tab1:
         overall = st.session_state.overall_trust
         gauge_color = "#10b981" if overall >= 0.90 else ("#f59e0b" if overall >= 0.80 else "#ef4444")
 
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=overall * 100,
-            number={"suffix": "%", "font": {"size": 48}},
-            delta={"reference": st.session_state.trust_scores[-2] * 100,
-                   "suffix": "%", "relative": False},
-            gauge={
-                "axis": {"range": [0, 100], "tickwidth": 1},
-                "bar": {"color": gauge_color},
-                "bgcolor": "#f0f2f6",
-                "steps": [
-                    {"range": [0, 70], "color": "#fef2f2"},
-                    {"range": [70, 85], "color": "#fffbeb"},
-                    {"range": [85, 100], "color": "#ecfdf5"},
-                ],
-                "threshold": {
-                    "line": {"color": "#764ba2", "width": 3},
-                    "thickness": 0.8,
-                    "value": st.session_state.confidence_threshold * 100,
-                },
-            },
-            title={"text": "Overall System Trust", "font": {"size": 16}},
-        ))
-        fig_gauge.update_layout(height=300, margin=dict(l=30, r=30, t=60, b=10))
-        st.plotly_chart(fig_gauge, use_container_width=True)
+        fig_gauge = build_gauge_fig(
+            overall,
+            st.session_state.trust_scores[-2],
+            st.session_state.confidence_threshold,
+            gauge_color,
+        )
+        st.plotly_chart(fig_gauge, use_container_width=True, config=STATIC_CHART_CONFIG)
 
     # --- Per-agent trust metric cards ---
     with col_agents:
         st.markdown("#### Per-Agent Trust Scores")
-        agent_cols = st.columns(len(AGENT_NAMES))
-        for idx, agent in enumerate(AGENT_NAMES):
+        cards = []
+        for agent in AGENT_NAMES:
             info = st.session_state.agent_trust[agent]
             t = info["trust"]
             card_class = (
@@ -313,14 +600,15 @@ with tab1:
                 "status-safe" if t >= 0.90
                 else ("status-warning" if t >= 0.80 else "status-danger")
             )
-            with agent_cols[idx]:
-                st.markdown(f"""
-                <div class="{card_class}">
-                    <div style="font-size:0.8rem;color:#6b7280;">{agent}</div>
-                    <div class="{status_class}" style="font-size:1.75rem;">{t:.0%}</div>
-                    <div style="font-size:0.75rem;color:#9ca3af;">Expertise {info['expertise']:.0%}</div>
-                </div>
-                """, unsafe_allow_html=True)
+            cards.append(_TRUST_CARD_TPL.substitute(
+                card_class=card_class,
+                status_class=status_class,
+                agent=agent,
+                trust=f"{t:.0%}",
+                expertise=f"{info['expertise']:.0%}",
+            ))
+        # One markdown element for all cards instead of one per agent
+        st.markdown(f'<div style="display:flex;gap:8px;">{"".join(cards)}</div>', unsafe_allow_html=True)
 
     st.divider()
 
@@ -330,35 +618,16 @@ with tab1:
     dates = st.session_state.trust_dates[-period:]
     scores = st.session_state.trust_scores[-period:]
 
-    fig_trend = go.Figure()
-    fig_trend.add_trace(go.Scatter(
-        x=dates, y=[s * 100 for s in scores],
-        mode="lines+markers",
-        line=dict(color="#667eea", width=3),
-        marker=dict(size=5),
-        fill="tozeroy",
-        fillcolor="rgba(102,126,234,0.10)",
-        name="Trust Score",
-    ))
-    fig_trend.add_hline(
-        y=st.session_state.confidence_threshold * 100,
-        line_dash="dash", line_color="#764ba2", line_width=2,
-        annotation_text=f"Threshold ({st.session_state.confidence_threshold:.0%})",
-        annotation_position="top left",
-    )
-    fig_trend.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Trust Score (%)",
-        yaxis=dict(range=[60, 100]),
-        height=300,
-        margin=dict(l=0, r=0, t=10, b=0),
-    )
-    st.plotly_chart(fig_trend, use_container_width=True)
+    fig_trend = build_trend_fig(tuple(dates), tuple(scores), st.session_state.confidence_threshold)
+    st.plotly_chart(fig_trend, use_container_width=True, config=HOVER_CHART_CONFIG)
+
 
 # =========================================================================
 # TAB 2 -- Calibration Curve Analysis
 # =========================================================================
-with tab2:
+@st.fragment
+def _render_tab2():
+    """Tab 2: per-agent calibration curves and ECE metrics."""
     st.subheader("Calibration Curve Analysis")
     st.markdown(
         "A well-calibrated system's predicted confidence matches its actual accuracy. "
@@ -375,47 +644,14 @@ with tab2:
             key="cal_agent_select",
         )
 
-        fig_cal = go.Figure()
-
-        # Perfect calibration line
-        fig_cal.add_trace(go.Scatter(
-            x=[0, 1], y=[0, 1],
-            mode="lines",
-            line=dict(color="#9ca3af", dash="dash", width=2),
-            name="Perfect Calibration",
-        ))
-
-        for agent in selected_agents:
-            bias = st.session_state.agent_trust[agent]["calibration_bias"]
-            bins, actual = _generate_calibration_data(n_bins=10, bias=bias)
-            fig_cal.add_trace(go.Scatter(
-                x=bins, y=actual,
-                mode="lines+markers",
-                line=dict(color=AGENT_COLORS[agent], width=3),
-                marker=dict(size=8),
-                name=agent,
+        if not selected_agents:
+            st.info("Select at least one agent to display calibration curves.")
+        else:
+            fig_cal = build_calibration_fig(tuple(
+                (agent, st.session_state.agent_trust[agent]["calibration_bias"])
+                for agent in selected_agents
             ))
-
-        # System aggregate
-        sys_bins, sys_actual = _generate_calibration_data(n_bins=10, bias=0.005)
-        fig_cal.add_trace(go.Scatter(
-            x=sys_bins, y=sys_actual,
-            mode="lines+markers",
-            line=dict(color="#764ba2", width=4, dash="dot"),
-            marker=dict(size=10, symbol="diamond"),
-            name="System Aggregate",
-        ))
-
-        fig_cal.update_layout(
-            xaxis_title="Predicted Confidence",
-            yaxis_title="Actual Accuracy",
-            xaxis=dict(range=[0, 1]),
-            yaxis=dict(range=[0, 1]),
-            height=480,
-            margin=dict(l=0, r=0, t=10, b=0),
-            legend=dict(orientation="h", yanchor="bottom", y=-0.25),
-        )
-        st.plotly_chart(fig_cal, use_container_width=True)
+            st.plotly_chart(fig_cal, use_container_width=True, config=HOVER_CHART_CONFIG)
 
     with col_metrics:
         st.markdown("#### ECE Metrics")
@@ -426,26 +662,17 @@ with tab2:
         )
 
         # System ECE
-        sys_ece = _compute_ece(sys_bins, sys_actual)
         ece_color = "#10b981" if sys_ece < 0.03 else ("#f59e0b" if sys_ece < 0.06 else "#ef4444")
-        st.markdown(f"""
-        <div class="metric-card" style="border-left-color:{ece_color};">
-            <div style="font-size:0.8rem;color:#6b7280;">System ECE</div>
-            <div style="font-size:2rem;font-weight:bold;color:{ece_color};">{sys_ece:.4f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
+        cards = [_METRIC_TPL.substitute(
+            color=ece_color, label="System ECE", size="2rem", value_color=ece_color, value=f"{sys_ece:.4f}",
+        )]
         for agent in AGENT_NAMES:
-            bias = st.session_state.agent_trust[agent]["calibration_bias"]
-            b, a = _generate_calibration_data(n_bins=10, bias=bias)
-            ece = _compute_ece(b, a)
+            ece = cal_cache[agent][2]
             label_color = AGENT_COLORS[agent]
-            st.markdown(f"""
-            <div class="metric-card" style="border-left-color:{label_color};">
-                <div style="font-size:0.8rem;color:#6b7280;">{agent}</div>
-                <div style="font-size:1.25rem;font-weight:bold;">{ece:.4f}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            cards.append(_METRIC_TPL.substitute(
+                color=label_color, label=agent, size="1.25rem", value_color="inherit", value=f"{ece:.4f}",
+            ))
+        st.markdown("".join(cards), unsafe_allow_html=True)
 
         st.divider()
         st.markdown("#### Interpretation")
@@ -455,10 +682,13 @@ with tab2:
             "ECE > 0.06 = needs recalibration."
         )
 
+
 # =========================================================================
 # TAB 3 -- Automation Level Recommendation
 # =========================================================================
-with tab3:
+@st.fragment
+def _render_tab3():
+    """Tab 3: recommended automation level, what-if analysis and contributing factors."""
     st.subheader("Automation Level Recommendation")
     st.markdown(
         "Based on current trust, confidence, and task stakes the system recommends "
@@ -548,29 +778,25 @@ with tab3:
             ("Confidence Threshold", threshold, threshold <= 0.85),
             ("Task Stakes", 0.65, True),
             ("Safety Status", 0.96, True),
-            ("Calibration Quality (1-ECE)", 1 - _compute_ece(sys_bins, sys_actual), True),
+            ("Calibration Quality (1-ECE)", 1 - sys_ece, True),
         ]
+        cards = []
         for label, val, ok in factors:
-            icon = "checkmark" if ok else "warning"
             badge = (
                 '<span style="color:#10b981;font-weight:bold;">PASS</span>'
                 if ok
                 else '<span style="color:#f59e0b;font-weight:bold;">REVIEW</span>'
             )
-            st.markdown(f"""
-            <div class="metric-card" style="padding:0.75rem 1rem;">
-                <div style="display:flex;justify-content:space-between;align-items:center;">
-                    <span style="font-size:0.85rem;">{label}</span>
-                    {badge}
-                </div>
-                <div style="font-size:1.1rem;font-weight:bold;">{val:.0%}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            cards.append(_FACTOR_TPL.substitute(label=label, badge=badge, value=f"{val:.0%}"))
+        st.markdown("".join(cards), unsafe_allow_html=True)
+
 
 # =========================================================================
 # TAB 4 -- Collective Confidence Aggregation
 # =========================================================================
-with tab4:
+@st.fragment
+def _render_tab4():
+    """Tab 4: expertise-weighted aggregation of agent confidences."""
     st.subheader("Collective Confidence Aggregation")
     st.markdown(
         "Visualise how individual agent confidences are combined into a single "
@@ -616,68 +842,13 @@ with tab4:
         st.markdown("#### Expertise-Weighted Voting Breakdown")
 
         # Stacked horizontal bar showing each agent's weighted contribution
-        contributions = weights * confs
-        total = contributions.sum()
-        pct = contributions / total * 100
-
-        fig_vote = go.Figure()
-        cumulative = 0.0
-        for idx, agent in enumerate(AGENT_NAMES):
-            fig_vote.add_trace(go.Bar(
-                y=["Collective"],
-                x=[pct[idx]],
-                orientation="h",
-                name=agent,
-                marker_color=AGENT_COLORS[agent],
-                text=f"{pct[idx]:.1f}%",
-                textposition="inside",
-                hovertemplate=(
-                    f"{agent}<br>"
-                    f"Confidence: {confs[idx]:.0%}<br>"
-                    f"Weight: {weights[idx]:.2f}<br>"
-                    f"Contribution: {pct[idx]:.1f}%<extra></extra>"
-                ),
-            ))
-            cumulative += pct[idx]
-
-        fig_vote.update_layout(
-            barmode="stack",
-            height=120,
-            margin=dict(l=0, r=0, t=10, b=0),
-            xaxis=dict(title="Contribution (%)", range=[0, 100]),
-            yaxis=dict(visible=False),
-            legend=dict(orientation="h", yanchor="top", y=-0.6),
-        )
-        st.plotly_chart(fig_vote, use_container_width=True)
+        fig_vote = build_vote_fig(tuple(confs), tuple(weights))
+        st.plotly_chart(fig_vote, use_container_width=True, config=HOVER_CHART_CONFIG)
 
         st.divider()
         st.markdown("#### Weighted vs Unweighted Comparison")
 
-        comp_df = pd.DataFrame({
-            "Agent": AGENT_NAMES,
-            "Confidence": confs,
-            "Weight": weights,
-            "Weighted Contribution": contributions,
-        })
-
-        fig_comp = go.Figure()
-        fig_comp.add_trace(go.Bar(
-            x=AGENT_NAMES, y=confs,
-            name="Raw Confidence",
-            marker_color="rgba(102,126,234,0.45)",
-        ))
-        fig_comp.add_trace(go.Bar(
-            x=AGENT_NAMES, y=contributions / weights.max(),
-            name="Weighted Confidence",
-            marker_color="rgba(118,75,162,0.75)",
-        ))
-        fig_comp.update_layout(
-            barmode="group",
-            yaxis_title="Score",
-            height=320,
-            margin=dict(l=0, r=0, t=10, b=0),
-            legend=dict(orientation="h", yanchor="bottom", y=-0.25),
-        )
+        fig_comp = build_comparison_fig(tuple(confs), tuple(weights))
         st.plotly_chart(fig_comp, use_container_width=True)
 
         st.markdown(
@@ -687,22 +858,22 @@ with tab4:
             unsafe_allow_html=True,
         )
 
+
 # =========================================================================
 # TAB 5 -- Historical Trust Performance
 # =========================================================================
-with tab5:
+@st.fragment
+def _render_tab5():
+    """Tab 5: task log, rolling accuracy and confidence bias detection."""
     st.subheader("Historical Trust Performance")
 
-    task_log = st.session_state.task_log
-
     # --- Recent tasks table ---
     st.markdown("#### Recent Tasks: Predicted vs Actual")
-    log_df = pd.DataFrame(task_log)
+    log_df = task_log_df.copy()
     log_df["Outcome"] = log_df["actual_correct"].map({True: "Correct", False: "Incorrect"})
-    log_df["Calibration Gap"] = log_df.apply(
-        lambda r: round(r["predicted_confidence"] - (1.0 if r["actual_correct"] else 0.0), 2),
-        axis=1,
-    )
+    log_df["Calibration Gap"] = (
+        log_df["predicted_confidence"].to_numpy() - log_df["actual_correct"].to_numpy(dtype=np.float64)
+    ).round(2)
 
     display_df = log_df[[
         "task_id", "task", "agent", "predicted_confidence", "Outcome", "Calibration Gap", "timestamp"
@@ -712,8 +883,22 @@ with tab5:
         "agent": "Agent",
         "predicted_confidence": "Predicted Conf.",
         "timestamp": "Timestamp",
+    }).astype({
+        "Agent": "category",
+        "Outcome": "category",
+        "Predicted Conf.": "float32",
+        "Calibration Gap": "float32",
     })
-    st.dataframe(display_df, use_container_width=True, hide_index=True, height=380)
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        height=380,
+        column_config={
+            "Predicted Conf.": st.column_config.NumberColumn(format="%.2f"),
+            "Calibration Gap": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
 
     st.divider()
 
@@ -725,54 +910,24 @@ with tab5:
         correct_series = log_df["actual_correct"].astype(int)
         rolling_acc = correct_series.rolling(window=5, min_periods=1).mean()
 
-        fig_acc = go.Figure()
-        fig_acc.add_trace(go.Scatter(
-            x=list(range(len(rolling_acc))),
-            y=rolling_acc.values * 100,
-            mode="lines+markers",
-            line=dict(color="#667eea", width=3),
-            marker=dict(size=6),
-            fill="tozeroy",
-            fillcolor="rgba(102,126,234,0.08)",
-            name="Rolling Accuracy (w=5)",
-        ))
-        fig_acc.add_hline(
-            y=st.session_state.confidence_threshold * 100,
-            line_dash="dash", line_color="#764ba2",
-            annotation_text="Threshold",
-        )
-        fig_acc.update_layout(
-            xaxis_title="Task Sequence",
-            yaxis_title="Accuracy (%)",
-            yaxis=dict(range=[40, 105]),
-            height=300,
-            margin=dict(l=0, r=0, t=10, b=0),
+        fig_acc = build_accuracy_fig(
+            tuple(rolling_acc), st.session_state.confidence_threshold, overall_accuracy
         )
-        st.plotly_chart(fig_acc, use_container_width=True)
+        st.plotly_chart(fig_acc, use_container_width=True, config=HOVER_CHART_CONFIG)
 
     with col_bias:
         st.markdown("#### Over-confidence & Under-confidence Detection")
 
-        conf_vals = log_df["predicted_confidence"].values
-        outcomes = log_df["actual_correct"].astype(int).values
+        conf_vals = log_df["predicted_confidence"].to_numpy()
+        outcomes = log_df["actual_correct"].to_numpy(dtype=np.float64)
         gaps = conf_vals - outcomes
 
-        overconfident = int((gaps > 0.15).sum())
-        underconfident = int((gaps < -0.15).sum())
-        well_calibrated = len(gaps) - overconfident - underconfident
-
-        fig_bias = go.Figure(data=[go.Pie(
-            labels=["Well-Calibrated", "Over-confident", "Under-confident"],
-            values=[well_calibrated, overconfident, underconfident],
-            hole=0.45,
-            marker=dict(colors=["#10b981", "#ef4444", "#f59e0b"]),
-            textinfo="label+value",
-        )])
-        fig_bias.update_layout(
-            height=300,
-            margin=dict(l=0, r=0, t=10, b=0),
-        )
-        st.plotly_chart(fig_bias, use_container_width=True)
+        overconfident = int(np.count_nonzero(gaps > 0.15))
+        underconfident = int(np.count_nonzero(gaps < -0.15))
+        well_calibrated = gaps.size - overconfident - underconfident
+
+        fig_bias = build_bias_fig(well_calibrated, overconfident, underconfident)
+        st.plotly_chart(fig_bias, use_container_width=True, config=STATIC_CHART_CONFIG)
 
         if overconfident > underconfident:
             st.warning(
@@ -787,10 +942,13 @@ with tab5:
         else:
             st.success("System is well-calibrated across recent tasks.")
 
+
 # =========================================================================
 # TAB 6 -- Trust Building Recommendations
 # =========================================================================
-with tab6:
+@st.fragment
+def _render_tab6():
+    """Tab 6: system-level and per-agent trust building recommendations."""
     st.subheader("Trust Building Recommendations")
     st.markdown(
         "Actionable insights generated from recent calibration analysis and "
@@ -800,8 +958,6 @@ with tab6:
     # --- System-level recommendations ---
     st.markdown("#### System-Level Insights")
 
-    sys_ece = _compute_ece(sys_bins, sys_actual)
-
     system_recs = []
     if sys_ece > 0.04:
         system_recs.append({
@@ -826,8 +982,7 @@ with tab6:
             "color": "#f59e0b",
         })
 
-    task_log_df = pd.DataFrame(st.session_state.task_log)
-    accuracy = task_log_df["actual_correct"].mean()
+    accuracy = overall_accuracy
     if accuracy < 0.85:
         system_recs.append({
             "priority": "High",
@@ -851,33 +1006,18 @@ with tab6:
         "color": "#667eea",
     })
 
-    for rec in system_recs:
-        st.markdown(f"""
-        <div class="rec-card" style="border-left-color:{rec['color']};">
-            <div style="display:flex;justify-content:space-between;align-items:center;">
-                <span style="font-weight:bold;font-size:1rem;">{rec['title']}</span>
-                <span style="font-size:0.75rem;padding:2px 8px;border-radius:4px;
-                       background:{rec['color']}20;color:{rec['color']};font-weight:600;">
-                    {rec['priority']}
-                </span>
-            </div>
-            <div style="font-size:0.875rem;color:#4b5563;margin-top:0.5rem;">
-                {rec['detail']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown("".join(_REC_TPL.substitute(rec) for rec in system_recs), unsafe_allow_html=True)
 
     st.divider()
 
     # --- Per-agent recommendations ---
     st.markdown("#### Agent-Specific Recommendations")
 
-    agent_rec_cols = st.columns(2)
+    column_cards = ([], [])
     for idx, agent in enumerate(AGENT_NAMES):
         info = st.session_state.agent_trust[agent]
         bias = info["calibration_bias"]
-        agent_tasks = task_log_df[task_log_df["agent"] == agent]
-        agent_accuracy = agent_tasks["actual_correct"].mean() if len(agent_tasks) > 0 else 1.0
+        agent_accuracy = agent_acc_map.get(agent, 1.0)
 
         recs = []
         if abs(bias) > 0.02:
@@ -899,23 +1039,22 @@ with tab6:
         if not recs:
             recs.append("Agent is performing well. No action required.")
 
-        col_target = agent_rec_cols[idx % 2]
-        with col_target:
-            color = AGENT_COLORS[agent]
-            rec_html = "".join(
-                f'<li style="margin-bottom:4px;">{r}</li>' for r in recs
-            )
-            st.markdown(f"""
-            <div class="metric-card" style="border-left-color:{color};">
-                <div style="font-weight:bold;color:{color};margin-bottom:6px;">{agent}</div>
-                <div style="font-size:0.8rem;color:#6b7280;margin-bottom:4px;">
-                    Trust {info['trust']:.0%} &nbsp;|&nbsp; Accuracy {agent_accuracy:.0%} &nbsp;|&nbsp; Bias {bias:+.3f}
-                </div>
-                <ul style="font-size:0.85rem;color:#374151;padding-left:1.25rem;margin:0;">
-                    {rec_html}
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
+        color = AGENT_COLORS[agent]
+        rec_html = "".join(
+            f'<li style="margin-bottom:4px;">{r}</li>' for r in recs
+        )
+        column_cards[idx % 2].append(_AGENT_REC_TPL.substitute(
+            color=color,
+            agent=agent,
+            trust=f"{info['trust']:.0%}",
+            accuracy=f"{agent_accuracy:.0%}",
+            bias=f"{bias:+.3f}",
+            items=rec_html,
+        ))
+
+    for col, cards in zip(st.columns(2), column_cards):
+        with col:
+            st.markdown("".join(cards), unsafe_allow_html=True)
 
     st.divider()
 
@@ -945,3 +1084,27 @@ with tab6:
     with qa_cols[3]:
         if st.button("Schedule Daily Audit", use_container_width=True):
             st.toast("Daily trust audit scheduled at 00:00 UTC.")
+
+
+# =========================================================================
+# VIEW LAYOUT
+# Only the selected view is rendered; each view is a fragment, so widgets
+# inside it only rerun that view.
+# =========================================================================
+TAB_RENDERERS = {
+    "Overview": _render_tab1,
+    "Calibration Curves": _render_tab2,
+    "Automation Level": _render_tab3,
+    "Collective Confidence": _render_tab4,
+    "Historical Performance": _render_tab5,
+    "Recommendations": _render_tab6,
+}
+
+active_tab = st.radio(
+    "View",
+    tuple(TAB_RENDERERS),
+    horizontal=True,
+    key="active_tab",
+    label_visibility="collapsed",
+)
+TAB_RENDERERS[active_tab]()
@@ -7,11 +7,19 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 import json
+from collections import Counter
 from datetime import datetime, timedelta
+from typing import NamedTuple
 import random
-import io
-import csv
+import zlib
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used as a fallback
+    orjson = None
 
 st.set_page_config(page_title="Audit & Compliance", page_icon="📋", layout="wide")
 
@@ -55,6 +63,11 @@ st.markdown("""
         border-radius: 0.5rem;
         margin-bottom: 0.5rem;
     }
+    .compliance-grid {
+        display: grid;
+        grid-template-columns: repeat(4, minmax(0, 1fr));
+        column-gap: 1rem;
+    }
     .status-safe { color: #10b981; font-weight: bold; }
     .status-warning { color: #f59e0b; font-weight: bold; }
     .status-danger { color: #ef4444; font-weight: bold; }
@@ -77,8 +90,9 @@ st.markdown("""
 # Session-state initialisation & sample data
 # ---------------------------------------------------------------------------
 
+@st.cache_data(show_spinner=False)
 def _generate_audit_entries():
-    """Return a list of sample audit-trail entries."""
+    """Return a list of sample audit-trail entries (seeded, so cached across sessions)."""
     agents_pool = [
         "Code Generator", "Security Analyst", "Code Reviewer",
         "Test Generator", "Risk Manager", "Compliance Officer",
@@ -115,17 +129,25 @@ def _generate_audit_entries():
         "Deferred pending additional data",
     ]
 
-    random.seed(42)
+    rng = np.random.default_rng(42)
+    n = len(tasks)
+    num_agents = rng.integers(2, 5, n)
+    confidences = rng.uniform(0.72, 0.99, n).round(2)
+    safeties = rng.choice(safety_choices, n)
+    interventions = rng.random(n) < 0.25
+    chosen_decisions = rng.choice(decisions, n)
+    jitter = rng.integers(0, 16, n)
+
     base_time = datetime(2024, 2, 7, 8, 0, 0)
     entries = []
     for idx, (task, domain) in enumerate(tasks):
-        num_agents = random.randint(2, 4)
-        involved = random.sample(agents_pool, num_agents)
-        confidence = round(random.uniform(0.72, 0.99), 2)
-        safety = random.choice(safety_choices)
-        human = random.choice([True, False, False, False])
-        decision = random.choice(decisions)
-        ts = base_time + timedelta(minutes=idx * 47 + random.randint(0, 15))
+        picks = rng.permutation(len(agents_pool))[:num_agents[idx]]
+        involved = [agents_pool[i] for i in picks]
+        confidence = float(confidences[idx])
+        safety = str(safeties[idx])
+        human = bool(interventions[idx])
+        decision = str(chosen_decisions[idx])
+        ts = base_time + timedelta(minutes=idx * 47 + int(jitter[idx]))
 
         entries.append({
             "id": f"DEC-2024-{idx + 1:04d}",
@@ -154,6 +176,162 @@ def _generate_audit_entries():
     return entries
 
 
+AUDIT_FIELDS = [
+    "id", "timestamp", "task", "domain", "agents", "decision",
+    "confidence", "safety_status", "human_intervention",
+]
+SAFETY_ICON = {"Safe": "🟢", "Warning": "🟡", "Critical": "🔴"}
+SAFETY_LABEL = {status: f"{icon} {status}" for status, icon in SAFETY_ICON.items()}
+SAFETY_COLOR = {"Safe": "#10b981", "Warning": "#f59e0b", "Critical": "#ef4444"}
+SAFETY_LEVELS = tuple(SAFETY_ICON)
+INCIDENT_LEVELS = frozenset({"Warning", "Critical"})
+
+# Compliance category status -> presentation
+STATUS_CSS = {
+    "safe": "compliance-safe",
+    "warning": "compliance-warning",
+    "critical": "compliance-critical",
+}
+STATUS_ICON = {"safe": "🟢", "warning": "🟡", "critical": "🔴"}
+STATUS_LABEL = {"safe": "Compliant", "warning": "Needs Attention", "critical": "Non-Compliant"}
+FLAGGED_STATUSES = frozenset({"warning", "critical"})
+
+# Stakeholder perspectives offered by the sidebar and the Stakeholder Views tab
+VIEW_CHOICES = ("Developer", "Auditor", "Regulator", "End User")
+VIEW_INDEX = {v: i for i, v in enumerate(VIEW_CHOICES)}
+
+
+@st.cache_data(show_spinner=False)
+def _audit_frame(entries):
+    """Return the full audit trail as a DataFrame aligned with ``entries``.
+
+    Lower-cased copies of the searchable columns are added once here so the
+    search box does not re-lowercase every row on each keystroke.
+    """
+    df = pd.DataFrame(entries, columns=AUDIT_FIELDS)
+    df["_task_lc"] = df["task"].str.lower()
+    df["_id_lc"] = df["id"].str.lower()
+    return df
+
+
+CSV_COLUMNS = {
+    "id": "ID",
+    "timestamp": "Timestamp",
+    "task": "Task",
+    "domain": "Domain",
+    "agents": "Agents",
+    "decision": "Decision",
+    "confidence": "Confidence",
+    "safety_status": "Safety",
+    "human_intervention": "Human Intervention",
+}
+
+
+@st.cache_data(show_spinner=False)
+def _audit_json(entries):
+    """Serialize audit entries to indented JSON once per distinct entry list."""
+    return json.dumps(entries, indent=2, default=str)
+
+
+@st.cache_data(show_spinner=False)
+def _entries_to_csv(entries):
+    """Serialize audit entries to CSV using pandas' writer."""
+    df = pd.DataFrame(entries, columns=AUDIT_FIELDS)
+    df["agents"] = df["agents"].str.join("; ")
+    return df.rename(columns=CSV_COLUMNS).to_csv(index=False)
+
+
+def _audit_table(df):
+    """Project raw audit columns into the display table.
+
+    Confidence and human intervention stay numeric/boolean; ``st.dataframe``
+    formats them through ``column_config``.
+    """
+    return pd.DataFrame({
+        "ID": df["id"],
+        "Timestamp": df["timestamp"],
+        "Task": df["task"],
+        "Domain": df["domain"],
+        "Agents": df["agents"].str.join(", "),
+        "Decision": df["decision"],
+        "Confidence": df["confidence"],
+        "Safety": df["safety_status"].map(SAFETY_LABEL),
+        "Human": df["human_intervention"].astype(bool),
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _domain_options(entries):
+    """Sorted, de-duplicated domains for the audit trail filter."""
+    return tuple(sorted({e["domain"] for e in entries}))
+
+
+@st.cache_data(show_spinner=False)
+def _prov_options(entries):
+    """Return provenance selector labels and a label -> entry index map."""
+    labels = [f"{e['id']} -- {e['task']}" for e in entries]
+    return labels, {label: idx for idx, label in enumerate(labels)}
+
+
+@st.cache_data(show_spinner=False)
+def _alignment(entry_id):
+    """Constitutional alignment scores, seeded per decision so they stay stable."""
+    rng = random.Random(entry_id)
+    return (
+        ("Transparency", rng.randint(90, 100)),
+        ("Safety First", rng.randint(85, 100)),
+        ("Human Oversight", rng.randint(88, 100)),
+        ("Fairness", rng.randint(82, 100)),
+    )
+
+
+def _reasoning_html(steps):
+    """Render a reasoning chain as one HTML block of provenance steps."""
+    return "".join(
+        f'<div class="provenance-step"><strong>Step {i}:</strong> {step}</div>'
+        for i, step in enumerate(steps, 1)
+    )
+
+
+def _sources_md(sources):
+    """Render data sources as a single markdown bullet list."""
+    return "\n".join(f"- {ds}" for ds in sources)
+
+
+class AuditSummary(NamedTuple):
+    total: int
+    safe: int
+    warning: int
+    critical: int
+    interventions: int
+    avg_confidence: float
+    safe_pct: float
+    incident_count: int
+
+
+@st.cache_data(show_spinner=False)
+def _summarize(entries):
+    """Reduce the audit entries to headline counts in a single pass."""
+    status_counts = Counter()
+    interventions = 0
+    confidence_sum = 0.0
+    for e in entries:
+        status_counts[e["safety_status"]] += 1
+        interventions += e["human_intervention"]
+        confidence_sum += e["confidence"]
+    total = len(entries)
+    return AuditSummary(
+        total=total,
+        safe=status_counts["Safe"],
+        warning=status_counts["Warning"],
+        critical=status_counts["Critical"],
+        interventions=interventions,
+        avg_confidence=confidence_sum / total if total else 0.0,
+        safe_pct=status_counts["Safe"] / total if total else 0.0,
+        incident_count=status_counts["Warning"] + status_counts["Critical"],
+    )
+
+
 def _init_session_state():
     if "audit_entries" not in st.session_state:
         st.session_state.audit_entries = _generate_audit_entries()
@@ -247,6 +425,303 @@ COMPLIANCE_FRAMEWORKS = {
     },
 }
 
+# Flattened views of the frameworks, computed once at import
+FRAMEWORK_KEYS = tuple(COMPLIANCE_FRAMEWORKS)
+FRAMEWORK_INDEX = {k: i for i, k in enumerate(FRAMEWORK_KEYS)}
+FRAMEWORK_SCORES = np.fromiter(
+    (fv["overall"] for fv in COMPLIANCE_FRAMEWORKS.values()), dtype=np.int8,
+)
+FRAMEWORK_STATUS = np.where(
+    FRAMEWORK_SCORES >= 90, "Compliant",
+    np.where(FRAMEWORK_SCORES >= 80, "Needs Attention", "At Risk"),
+)
+FRAMEWORK_DELTA_COLOR = np.where(FRAMEWORK_SCORES >= 90, "normal", "inverse")
+
+
+# ---------------------------------------------------------------------------
+# Regulatory report
+# ---------------------------------------------------------------------------
+# Static report preview HTML, one entry per section header
+SECTION_HEADERS = {
+    "overview": (
+        '<div class="report-section">'
+        "<h4>1. System Overview</h4>"
+        "<p><strong>System:</strong> CoHumAIn Multi-Agent Framework v2.1</p>"
+        "<p><strong>Purpose:</strong> Explainable multi-agent AI system with constitutional "
+        "principles and hierarchical transparency for regulated industries.</p>"
+        "<p><strong>Deployment:</strong> Production environment, on-premise with cloud monitoring.</p>"
+        "<p><strong>Classification:</strong> High-risk AI system (under EU AI Act Art. 6)</p>"
+        "</div>"
+    ),
+    "agents": '<div class="report-section"><h4>2. Agent Inventory</h4></div>',
+    "decisions": '<div class="report-section"><h4>3. Decision Summary</h4></div>',
+    "incidents": '<div class="report-section"><h4>4. Safety Incidents</h4></div>',
+    "interventions": '<div class="report-section"><h4>5. Human Intervention Log</h4></div>',
+    "attestation": '<div class="report-section"><h4>6. Compliance Attestation</h4></div>',
+}
+
+AGENT_INVENTORY = [
+    {"Agent": "Code Generator", "Role": "Code Generation", "Risk Level": "Medium", "Status": "Active"},
+    {"Agent": "Security Analyst", "Role": "Security Analysis", "Risk Level": "High", "Status": "Active"},
+    {"Agent": "Code Reviewer", "Role": "Code Review", "Risk Level": "Medium", "Status": "Active"},
+    {"Agent": "Test Generator", "Role": "Test Generation", "Risk Level": "Low", "Status": "Active"},
+    {"Agent": "Risk Manager", "Role": "Risk Assessment", "Risk Level": "High", "Status": "Active"},
+    {"Agent": "Compliance Officer", "Role": "Compliance Checking", "Risk Level": "Critical", "Status": "Active"},
+]
+
+
+# The report tables are static, so they are kept as Arrow tables that
+# st.dataframe can send without a per-rerun pandas conversion.
+@st.cache_resource
+def _agent_inventory_table():
+    """Agent inventory table for the report preview."""
+    return pa.Table.from_pylist(AGENT_INVENTORY)
+
+
+@st.cache_resource
+def _category_table(fw_key):
+    """Category attestation table for one framework."""
+    categories = COMPLIANCE_FRAMEWORKS[fw_key]["categories"]
+    return pa.table({
+        "Category": list(categories),
+        "Score": [f"{info['score']}%" for info in categories.values()],
+        "Status": [STATUS_LABEL[info["status"]] for info in categories.values()],
+    })
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_report_payload(rpt_fw, report_period, summary, safety_incidents):
+    """Report body for ``rpt_fw``; timestamps are filled in by ``_report_json``."""
+    rpt_data = COMPLIANCE_FRAMEWORKS[rpt_fw]
+    return {
+        "report_title": f"{rpt_fw} Compliance Report",
+        "framework": rpt_fw,
+        "full_name": rpt_data["full_name"],
+        "generated_at": None,
+        "reporting_period": report_period,
+        "system": "CoHumAIn Multi-Agent Framework v2.1",
+        "overall_score": rpt_data["overall"],
+        "categories": rpt_data["categories"],
+        "decision_summary": {
+            "total": summary.total,
+            "avg_confidence": round(summary.avg_confidence, 2),
+            "safe": summary.safe,
+            "warning": summary.warning,
+            "critical": summary.critical,
+            "human_interventions": summary.interventions,
+        },
+        "agent_inventory": AGENT_INVENTORY,
+        "safety_incidents": safety_incidents,
+        "attestation": (
+            f"This report certifies that the CoHumAIn system has been evaluated "
+            f"against {rpt_fw} ({rpt_data['full_name']}) requirements. "
+            f"Overall compliance score: {rpt_data['overall']}%. "
+        ),
+    }
+
+
+def _dumps(obj):
+    """Encode ``obj`` as indented JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _report_json(report_payload):
+    """Stamp the report with the current time and encode it for download."""
+    now = datetime.now()
+    return _dumps(
+        dict(
+            report_payload,
+            generated_at=now.isoformat(sep=" ", timespec="seconds"),
+            attestation=(
+                f"{report_payload['attestation']}"
+                f"Generated automatically on {now.date().isoformat()}."
+            ),
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Developer view panels
+# ---------------------------------------------------------------------------
+SYSTEM_CONFIG = {
+    "confidence_threshold": 0.80,
+    "delegation_strategy": "weighted_voting",
+    "constitutional_check": True,
+    "max_retries": 3,
+    "timeout_seconds": 60,
+    "audit_logging": "verbose",
+}
+SYSTEM_CONFIG_JSON = _dumps(SYSTEM_CONFIG).decode()
+
+
+@st.cache_data(show_spinner=False)
+def _api_response_spec(fw_key):
+    """Static part of the compliance API response; the caller adds the timestamp."""
+    fw = COMPLIANCE_FRAMEWORKS[fw_key]
+    return {
+        "framework": fw_key,
+        "overall_score": fw["overall"],
+        "categories": fw["categories"],
+        "api_version": "v2.1",
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _demo_entry_json(entry_id, _entry):
+    """Raw JSON for the representative audit entry, cached on its ID."""
+    return _dumps(_entry).decode()
+
+
+# ---------------------------------------------------------------------------
+# Figure builders
+# Figures are cached on their (hashable) inputs, so reruns that do not change
+# what a chart shows reuse the existing figure object.
+# ---------------------------------------------------------------------------
+TREND_MONTHS = [
+    "Mar", "Apr", "May", "Jun", "Jul", "Aug",
+    "Sep", "Oct", "Nov", "Dec", "Jan", "Feb",
+]
+TREND_COLORS = ["#667eea", "#764ba2", "#10b981", "#f59e0b", "#ef4444"]
+SAFETY_COLORS = list(SAFETY_COLOR.values())
+
+
+@st.cache_data(show_spinner=False)
+def _trend_matrix():
+    """Return a (frameworks x 12) array of monthly compliance scores."""
+    base = FRAMEWORK_SCORES.astype(float)[:, None]
+    rng = np.random.default_rng(7)
+    noise = rng.integers(-2, 3, size=(base.shape[0], len(TREND_MONTHS)))
+    trend = np.clip(base - 8 + np.arange(len(TREND_MONTHS)) * 0.6 + noise, 60, 100)
+    trend[:, -1] = base[:, 0]  # ensure current month matches overall
+    return trend
+
+
+@st.cache_resource(max_entries=32)
+def build_trend_fig():
+    """12-month compliance score trend for every framework."""
+    trend = _trend_matrix()
+    fig = go.Figure()
+    for idx, fk in enumerate(FRAMEWORK_KEYS):
+        fig.add_trace(go.Scatter(
+            x=TREND_MONTHS,
+            y=trend[idx],
+            mode="lines+markers",
+            name=fk,
+            line=dict(color=TREND_COLORS[idx % len(TREND_COLORS)], width=2),
+            marker=dict(size=6),
+        ))
+    fig.update_layout(
+        yaxis_title="Compliance Score (%)",
+        xaxis_title="Month",
+        height=350,
+        margin=dict(l=0, r=0, t=10, b=0),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_sankey_fig(agents_involved):
+    """Task -> agents -> collective decision flow for a tuple of agents."""
+    labels = ["Task Input"] + list(agents_involved) + ["Collective Decision"]
+    source_indices = []
+    target_indices = []
+    values = []
+    link_labels = []
+
+    # Task Input -> each agent
+    for i, agent in enumerate(agents_involved):
+        source_indices.append(0)
+        target_indices.append(i + 1)
+        values.append(1)
+        link_labels.append(f"Assigned to {agent}")
+
+    # Each agent -> Collective Decision
+    decision_idx = len(agents_involved) + 1
+    for i, agent in enumerate(agents_involved):
+        source_indices.append(i + 1)
+        target_indices.append(decision_idx)
+        values.append(1)
+        link_labels.append(f"{agent} contribution")
+
+    node_colors = (
+        ["#667eea"]
+        + ["#764ba2"] * len(agents_involved)
+        + ["#10b981"]
+    )
+
+    fig = go.Figure(data=[go.Sankey(
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(color="black", width=0.5),
+            label=labels,
+            color=node_colors,
+        ),
+        link=dict(
+            source=source_indices,
+            target=target_indices,
+            value=values,
+            label=link_labels,
+            color="rgba(102, 126, 234, 0.3)",
+        ),
+    )])
+    fig.update_layout(
+        title_text="Agent Contribution Flow",
+        font_size=12,
+        height=350,
+        margin=dict(l=0, r=0, t=40, b=0),
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_contribution_fig(weight_labels, norm_weights):
+    """Per-agent contribution share bar chart."""
+    fig = go.Figure(data=[go.Bar(
+        x=list(weight_labels),
+        y=np.asarray(norm_weights) * 100,
+        marker_color=["#667eea", "#764ba2", "#10b981", "#f59e0b"][:len(weight_labels)],
+    )])
+    fig.update_layout(
+        yaxis_title="Contribution (%)",
+        height=250,
+        margin=dict(l=0, r=0, t=10, b=0),
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_decision_pie(safe_count, warning_count, critical_count):
+    """Safe / warning / critical decision breakdown donut."""
+    fig = go.Figure(data=[go.Pie(
+        labels=SAFETY_LEVELS,
+        values=[safe_count, warning_count, critical_count],
+        marker=dict(colors=SAFETY_COLORS),
+        hole=0.4,
+    )])
+    fig.update_layout(height=250, margin=dict(l=0, r=0, t=10, b=0))
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def build_safety_bar(safe_count, warning_count, critical_count):
+    """Safe / warning / critical decision counts as bars."""
+    fig = go.Figure(data=[go.Bar(
+        x=SAFETY_LEVELS,
+        y=[safe_count, warning_count, critical_count],
+        marker_color=SAFETY_COLORS,
+    )])
+    fig.update_layout(
+        yaxis_title="Count",
+        height=250,
+        margin=dict(l=0, r=0, t=10, b=0),
+    )
+    return fig
+
+
 # ---------------------------------------------------------------------------
 # Sidebar
 # ---------------------------------------------------------------------------
@@ -271,10 +746,8 @@ with st.sidebar:
     st.markdown("**Regulatory Framework**")
     st.session_state.selected_framework = st.selectbox(
         "Select Framework",
-        list(COMPLIANCE_FRAMEWORKS.keys()),
-        index=list(COMPLIANCE_FRAMEWORKS.keys()).index(
-            st.session_state.selected_framework
-        ),
+        FRAMEWORK_KEYS,
+        index=FRAMEWORK_INDEX[st.session_state.selected_framework],
         key="sidebar_framework",
     )
 
@@ -283,10 +756,8 @@ with st.sidebar:
     st.markdown("**Stakeholder View**")
     st.session_state.stakeholder_view = st.radio(
         "Perspective",
-        ["Developer", "Auditor", "Regulator", "End User"],
-        index=["Developer", "Auditor", "Regulator", "End User"].index(
-            st.session_state.stakeholder_view
-        ),
+        VIEW_CHOICES,
+        index=VIEW_INDEX.get(st.session_state.stakeholder_view, 0),
         key="sidebar_stakeholder",
     )
 
@@ -302,31 +773,14 @@ with st.sidebar:
         if export_fmt == "JSON":
             st.download_button(
                 "Download JSON",
-                json.dumps(st.session_state.audit_entries, indent=2),
+                _audit_json(st.session_state.audit_entries),
                 file_name="cohumain_audit_trail.json",
                 mime="application/json",
             )
         elif export_fmt == "CSV":
-            rows = []
-            for e in st.session_state.audit_entries:
-                rows.append({
-                    "ID": e["id"],
-                    "Timestamp": e["timestamp"],
-                    "Task": e["task"],
-                    "Domain": e["domain"],
-                    "Agents": "; ".join(e["agents"]),
-                    "Decision": e["decision"],
-                    "Confidence": e["confidence"],
-                    "Safety": e["safety_status"],
-                    "Human Intervention": e["human_intervention"],
-                })
-            csv_buf = io.StringIO()
-            writer = csv.DictWriter(csv_buf, fieldnames=rows[0].keys())
-            writer.writeheader()
-            writer.writerows(rows)
             st.download_button(
                 "Download CSV",
-                csv_buf.getvalue(),
+                _entries_to_csv(st.session_state.audit_entries),
                 file_name="cohumain_audit_trail.csv",
                 mime="text/csv",
             )
@@ -361,20 +815,25 @@ st.markdown(
 VIEW = st.session_state.stakeholder_view
 
 # ---------------------------------------------------------------------------
-# Tabs
+# Audit summary shared by every tab
 # ---------------------------------------------------------------------------
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Compliance Dashboard",
-    "📜 Audit Trail",
-    "🔗 Decision Provenance",
-    "📄 Regulatory Reports",
-    "👥 Stakeholder Views",
-])
+entries = st.session_state.audit_entries
+summary = _summarize(entries)
+total_decisions = summary.total
+safe_count = summary.safe
+warning_count = summary.warning
+critical_count = summary.critical
+intervention_count = summary.interventions
+avg_confidence = summary.avg_confidence
+safe_pct_str = f"{summary.safe_pct:.0%}" if total_decisions else "n/a"
+
 
 # ===================================================================
 # TAB 1 -- Compliance Dashboard
 # ===================================================================
-with tab1:
+@st.fragment
+def _render_tab1():
+    """Tab 1: framework scores, headline metrics, category cards and trend."""
     st.subheader("Compliance Dashboard")
 
     fw_key = st.session_state.selected_framework
@@ -383,40 +842,24 @@ with tab1:
     st.markdown(f"**Active Framework:** {fw_key} -- {fw['full_name']}")
 
     # Framework selector row (quick-switch buttons)
-    fw_cols = st.columns(len(COMPLIANCE_FRAMEWORKS))
-    for idx, (fk, fv) in enumerate(COMPLIANCE_FRAMEWORKS.items()):
+    fw_cols = st.columns(len(FRAMEWORK_KEYS))
+    for idx, fk in enumerate(FRAMEWORK_KEYS):
         with fw_cols[idx]:
-            delta_color = "normal"
-            if fv["overall"] >= 90:
-                status_label = "Compliant"
-            elif fv["overall"] >= 80:
-                status_label = "Needs Attention"
-                delta_color = "inverse"
-            else:
-                status_label = "At Risk"
-                delta_color = "inverse"
             st.metric(
                 label=fk,
-                value=f"{fv['overall']}%",
-                delta=status_label,
-                delta_color=delta_color,
+                value=f"{FRAMEWORK_SCORES[idx]}%",
+                delta=str(FRAMEWORK_STATUS[idx]),
+                delta_color=str(FRAMEWORK_DELTA_COLOR[idx]),
             )
 
     st.divider()
 
     # Key metrics row
-    entries = st.session_state.audit_entries
-    total_decisions = len(entries)
-    safe_count = sum(1 for e in entries if e["safety_status"] == "Safe")
-    warning_count = sum(1 for e in entries if e["safety_status"] == "Warning")
-    critical_count = sum(1 for e in entries if e["safety_status"] == "Critical")
-    intervention_count = sum(1 for e in entries if e["human_intervention"])
-    avg_confidence = sum(e["confidence"] for e in entries) / len(entries)
 
     m1, m2, m3, m4, m5 = st.columns(5)
     m1.metric("Total Decisions", total_decisions)
     m2.metric("Avg Confidence", f"{avg_confidence:.0%}")
-    m3.metric("Safe Outcomes", safe_count, delta=f"{safe_count/total_decisions:.0%}")
+    m3.metric("Safe Outcomes", safe_count, delta=safe_pct_str if total_decisions else None)
     m4.metric("Warnings / Critical", f"{warning_count} / {critical_count}")
     m5.metric("Human Interventions", intervention_count)
 
@@ -425,65 +868,28 @@ with tab1:
     # Detailed category breakdown for the selected framework
     st.markdown(f"### {fw_key} Category Compliance")
 
-    cat_cols = st.columns(4)
-    for idx, (cat, info) in enumerate(fw["categories"].items()):
-        col = cat_cols[idx % 4]
-        with col:
-            css_class = {
-                "safe": "compliance-safe",
-                "warning": "compliance-warning",
-                "critical": "compliance-critical",
-            }[info["status"]]
-            icon = {"safe": "🟢", "warning": "🟡", "critical": "🔴"}[info["status"]]
-            st.markdown(
-                f'<div class="{css_class}">{icon} <strong>{cat}</strong><br/>'
-                f'Score: {info["score"]}%</div>',
-                unsafe_allow_html=True,
-            )
+    # All cards go out in one markdown element laid out by a 4-column grid
+    cards = "".join(
+        f'<div class="{STATUS_CSS[info["status"]]}">{STATUS_ICON[info["status"]]} '
+        f'<strong>{cat}</strong><br/>Score: {info["score"]}%</div>'
+        for cat, info in fw["categories"].items()
+    )
+    st.markdown(f'<div class="compliance-grid">{cards}</div>', unsafe_allow_html=True)
 
     st.divider()
 
     # Compliance trend chart
     st.markdown("### Compliance Score Trend (Last 12 Months)")
 
-    months = [
-        "Mar", "Apr", "May", "Jun", "Jul", "Aug",
-        "Sep", "Oct", "Nov", "Dec", "Jan", "Feb",
-    ]
-    random.seed(7)
-    trend_data = {}
-    for fk in COMPLIANCE_FRAMEWORKS:
-        base = COMPLIANCE_FRAMEWORKS[fk]["overall"]
-        trend_data[fk] = [
-            max(60, min(100, base - 8 + i * 0.6 + random.randint(-2, 2)))
-            for i in range(12)
-        ]
-        trend_data[fk][-1] = base  # ensure current month matches overall
+    st.plotly_chart(build_trend_fig(), use_container_width=True)
 
-    fig = go.Figure()
-    colors = ["#667eea", "#764ba2", "#10b981", "#f59e0b", "#ef4444"]
-    for idx, (fk, vals) in enumerate(trend_data.items()):
-        fig.add_trace(go.Scatter(
-            x=months,
-            y=vals,
-            mode="lines+markers",
-            name=fk,
-            line=dict(color=colors[idx % len(colors)], width=2),
-            marker=dict(size=6),
-        ))
-    fig.update_layout(
-        yaxis_title="Compliance Score (%)",
-        xaxis_title="Month",
-        height=350,
-        margin=dict(l=0, r=0, t=10, b=0),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-    )
-    st.plotly_chart(fig, use_container_width=True)
 
 # ===================================================================
 # TAB 2 -- Audit Trail
 # ===================================================================
-with tab2:
+@st.fragment
+def _render_tab2():
+    """Tab 2: filterable audit trail, decision details and filtered exports."""
     st.subheader("Decision Audit Trail")
     st.markdown("Searchable log of all decisions made by the multi-agent system.")
 
@@ -494,15 +900,16 @@ with tab2:
     with f2:
         safety_filter = st.multiselect(
             "Safety Status",
-            ["Safe", "Warning", "Critical"],
-            default=["Safe", "Warning", "Critical"],
+            SAFETY_LEVELS,
+            default=SAFETY_LEVELS,
             key="audit_safety_filter",
         )
     with f3:
+        domain_options = _domain_options(entries)
         domain_filter = st.multiselect(
             "Domain",
-            list({e["domain"] for e in entries}),
-            default=list({e["domain"] for e in entries}),
+            domain_options,
+            default=domain_options,
             key="audit_domain_filter",
         )
     with f4:
@@ -512,38 +919,40 @@ with tab2:
             key="audit_intervention_filter",
         )
 
-    # Apply filters
-    filtered = entries
+    # Apply filters as one boolean mask over the cached frame
+    audit_df = _audit_frame(entries)
+    mask = audit_df["safety_status"].isin(safety_filter) & audit_df["domain"].isin(domain_filter)
     if search_query:
         sq = search_query.lower()
-        filtered = [e for e in filtered if sq in e["task"].lower() or sq in e["id"].lower()]
-    filtered = [e for e in filtered if e["safety_status"] in safety_filter]
-    filtered = [e for e in filtered if e["domain"] in domain_filter]
+        mask &= (
+            audit_df["_task_lc"].str.contains(sq, regex=False, na=False)
+            | audit_df["_id_lc"].str.contains(sq, regex=False, na=False)
+        )
     if intervention_filter == "Yes":
-        filtered = [e for e in filtered if e["human_intervention"]]
+        mask &= audit_df["human_intervention"]
     elif intervention_filter == "No":
-        filtered = [e for e in filtered if not e["human_intervention"]]
+        mask &= ~audit_df["human_intervention"]
+    filtered_df = audit_df[mask]
+    filtered = [entries[i] for i in filtered_df.index]
+    filtered_by_id = {e["id"]: e for e in filtered}
 
     st.markdown(f"**Showing {len(filtered)} of {len(entries)} entries**")
 
     # Summary table
-    table_rows = []
-    for e in filtered:
-        safety_icon = {"Safe": "🟢", "Warning": "🟡", "Critical": "🔴"}[e["safety_status"]]
-        table_rows.append({
-            "ID": e["id"],
-            "Timestamp": e["timestamp"],
-            "Task": e["task"],
-            "Domain": e["domain"],
-            "Agents": ", ".join(e["agents"]),
-            "Decision": e["decision"],
-            "Confidence": f"{e['confidence']:.0%}",
-            "Safety": f"{safety_icon} {e['safety_status']}",
-            "Human": "Yes" if e["human_intervention"] else "No",
-        })
-
-    df_audit = pd.DataFrame(table_rows)
-    st.dataframe(df_audit, use_container_width=True, hide_index=True, height=400)
+    df_audit = _audit_table(filtered_df)
+    st.dataframe(
+        df_audit,
+        use_container_width=True,
+        hide_index=True,
+        height=400,
+        column_config={
+            "Confidence": st.column_config.ProgressColumn(
+                format="percent", min_value=0.0, max_value=1.0,
+            ),
+            "Safety": st.column_config.TextColumn(),
+            "Human": st.column_config.CheckboxColumn(),
+        },
+    )
 
     # Expandable details
     st.markdown("### Decision Details")
@@ -551,10 +960,10 @@ with tab2:
 
     selected_id = st.selectbox(
         "Decision ID",
-        [e["id"] for e in filtered],
+        list(filtered_by_id),
         key="audit_detail_id",
     )
-    selected_entry = next((e for e in filtered if e["id"] == selected_id), None)
+    selected_entry = filtered_by_id.get(selected_id)
 
     if selected_entry:
         with st.expander(f"Full details for {selected_id}", expanded=True):
@@ -566,18 +975,12 @@ with tab2:
                 st.markdown(f"**Agents:** {', '.join(selected_entry['agents'])}")
                 st.markdown(f"**Decision:** {selected_entry['decision']}")
                 st.markdown("**Reasoning Chain:**")
-                for step_idx, step in enumerate(selected_entry["reasoning"], 1):
-                    st.markdown(
-                        f'<div class="provenance-step">'
-                        f"<strong>Step {step_idx}:</strong> {step}</div>",
-                        unsafe_allow_html=True,
-                    )
+                st.markdown(_reasoning_html(selected_entry["reasoning"]), unsafe_allow_html=True)
             with d2:
                 st.markdown("**Metrics**")
                 st.metric("Confidence", f"{selected_entry['confidence']:.0%}")
-                safety_color_map = {"Safe": "#10b981", "Warning": "#f59e0b", "Critical": "#ef4444"}
                 st.markdown(
-                    f"<span style='color:{safety_color_map[selected_entry['safety_status']]}"
+                    f"<span style='color:{SAFETY_COLOR[selected_entry['safety_status']]}"
                     f";font-size:1.2rem;font-weight:bold;'>"
                     f"{selected_entry['safety_status']}</span>",
                     unsafe_allow_html=True,
@@ -586,8 +989,7 @@ with tab2:
                     f"**Human Intervention:** {'Yes' if selected_entry['human_intervention'] else 'No'}"
                 )
                 st.markdown("**Data Sources:**")
-                for ds in selected_entry["data_sources"]:
-                    st.markdown(f"- {ds}")
+                st.markdown(_sources_md(selected_entry["data_sources"]))
 
     # Export buttons for filtered data
     st.divider()
@@ -595,51 +997,35 @@ with tab2:
     with ex1:
         st.download_button(
             "📥 Export Filtered (JSON)",
-            json.dumps(filtered, indent=2, default=str),
+            _audit_json(filtered),
             file_name="audit_trail_filtered.json",
             mime="application/json",
         )
     with ex2:
-        csv_rows = []
-        for e in filtered:
-            csv_rows.append({
-                "ID": e["id"],
-                "Timestamp": e["timestamp"],
-                "Task": e["task"],
-                "Domain": e["domain"],
-                "Agents": "; ".join(e["agents"]),
-                "Decision": e["decision"],
-                "Confidence": e["confidence"],
-                "Safety": e["safety_status"],
-                "Human Intervention": e["human_intervention"],
-            })
-        buf = io.StringIO()
-        if csv_rows:
-            w = csv.DictWriter(buf, fieldnames=csv_rows[0].keys())
-            w.writeheader()
-            w.writerows(csv_rows)
         st.download_button(
             "📥 Export Filtered (CSV)",
-            buf.getvalue(),
+            _entries_to_csv(filtered),
             file_name="audit_trail_filtered.csv",
             mime="text/csv",
         )
 
+
 # ===================================================================
 # TAB 3 -- Decision Provenance
 # ===================================================================
-with tab3:
+@st.fragment
+def _render_tab3():
+    """Tab 3: reasoning flow, lineage and contribution weights for one decision."""
     st.subheader("Decision Provenance Explorer")
     st.markdown("Trace the complete chain of reasoning for any system decision.")
 
+    prov_labels, prov_index = _prov_options(entries)
     prov_id = st.selectbox(
         "Select Decision",
-        [f"{e['id']} -- {e['task']}" for e in entries],
+        prov_labels,
         key="provenance_select",
     )
-    prov_entry = entries[
-        [f"{e['id']} -- {e['task']}" for e in entries].index(prov_id)
-    ]
+    prov_entry = entries[prov_index[prov_id]]
 
     p1, p2 = st.columns([3, 2])
 
@@ -651,65 +1037,11 @@ with tab3:
         steps = prov_entry["reasoning"]
 
         # Visual flow diagram using plotly Sankey
-        labels = ["Task Input"] + agents_involved + ["Collective Decision"]
-        source_indices = []
-        target_indices = []
-        values = []
-        link_labels = []
-
-        # Task Input -> each agent
-        for i, agent in enumerate(agents_involved):
-            source_indices.append(0)
-            target_indices.append(i + 1)
-            values.append(1)
-            link_labels.append(f"Assigned to {agent}")
-
-        # Each agent -> Collective Decision
-        decision_idx = len(agents_involved) + 1
-        for i, agent in enumerate(agents_involved):
-            source_indices.append(i + 1)
-            target_indices.append(decision_idx)
-            values.append(1)
-            link_labels.append(f"{agent} contribution")
-
-        node_colors = (
-            ["#667eea"]
-            + ["#764ba2"] * len(agents_involved)
-            + ["#10b981"]
-        )
-
-        fig_sankey = go.Figure(data=[go.Sankey(
-            node=dict(
-                pad=15,
-                thickness=20,
-                line=dict(color="black", width=0.5),
-                label=labels,
-                color=node_colors,
-            ),
-            link=dict(
-                source=source_indices,
-                target=target_indices,
-                value=values,
-                label=link_labels,
-                color="rgba(102, 126, 234, 0.3)",
-            ),
-        )])
-        fig_sankey.update_layout(
-            title_text="Agent Contribution Flow",
-            font_size=12,
-            height=350,
-            margin=dict(l=0, r=0, t=40, b=0),
-        )
-        st.plotly_chart(fig_sankey, use_container_width=True)
+        st.plotly_chart(build_sankey_fig(tuple(agents_involved)), use_container_width=True)
 
         # Step-by-step reasoning
         st.markdown("### Step-by-Step Reasoning")
-        for step_idx, step in enumerate(steps, 1):
-            st.markdown(
-                f'<div class="provenance-step">'
-                f"<strong>Step {step_idx}:</strong> {step}</div>",
-                unsafe_allow_html=True,
-            )
+        st.markdown(_reasoning_html(steps), unsafe_allow_html=True)
 
     with p2:
         st.markdown("### Decision Metadata")
@@ -722,52 +1054,40 @@ with tab3:
 
         st.markdown("### Data Lineage")
         st.markdown("Sources consulted during this decision:")
-        for ds in prov_entry["data_sources"]:
-            st.markdown(f"- {ds}")
+        st.markdown(_sources_md(prov_entry["data_sources"]))
 
         st.divider()
 
         st.markdown("### Agent Contribution Weights")
         weight_labels = prov_entry["agents"]
-        random.seed(hash(prov_entry["id"]))
-        raw_weights = [random.uniform(0.5, 1.0) for _ in weight_labels]
-        total_w = sum(raw_weights)
-        norm_weights = [w / total_w for w in raw_weights]
-
-        fig_bar = go.Figure(data=[go.Bar(
-            x=weight_labels,
-            y=[w * 100 for w in norm_weights],
-            marker_color=["#667eea", "#764ba2", "#10b981", "#f59e0b"][:len(weight_labels)],
-        )])
-        fig_bar.update_layout(
-            yaxis_title="Contribution (%)",
-            height=250,
-            margin=dict(l=0, r=0, t=10, b=0),
+        rng = np.random.default_rng(zlib.crc32(prov_entry["id"].encode()))
+        norm_weights = rng.uniform(0.5, 1.0, len(weight_labels))
+        norm_weights /= norm_weights.sum()
+
+        st.plotly_chart(
+            build_contribution_fig(tuple(weight_labels), tuple(norm_weights.tolist())),
+            use_container_width=True,
         )
-        st.plotly_chart(fig_bar, use_container_width=True)
 
         st.divider()
 
         st.markdown("### Constitutional Alignment")
-        alignment_items = [
-            ("Transparency", random.randint(90, 100)),
-            ("Safety First", random.randint(85, 100)),
-            ("Human Oversight", random.randint(88, 100)),
-            ("Fairness", random.randint(82, 100)),
-        ]
-        for principle, score in alignment_items:
+        for principle, score in _alignment(prov_entry["id"]):
             st.progress(score / 100, text=f"{principle}: {score}%")
 
+
 # ===================================================================
 # TAB 4 -- Regulatory Reports
 # ===================================================================
-with tab4:
+@st.fragment
+def _render_tab4():
+    """Tab 4: regulatory report preview and JSON download."""
     st.subheader("Regulatory Report Generator")
     st.markdown("Generate pre-built compliance reports for regulatory submissions.")
 
     rpt_fw = st.selectbox(
         "Report Framework",
-        list(COMPLIANCE_FRAMEWORKS.keys()),
+        FRAMEWORK_KEYS,
         key="report_framework",
     )
     rpt_data = COMPLIANCE_FRAMEWORKS[rpt_fw]
@@ -783,112 +1103,72 @@ with tab4:
     st.markdown(f"### {rpt_fw} Compliance Report Preview")
     st.markdown(f"*{rpt_data['full_name']}*")
 
-    # Section 1 -- System overview
+    # Sections 1 and 2 -- System overview and agent inventory header
     st.markdown(
-        '<div class="report-section">'
-        "<h4>1. System Overview</h4>"
-        "<p><strong>System:</strong> CoHumAIn Multi-Agent Framework v2.1</p>"
-        "<p><strong>Purpose:</strong> Explainable multi-agent AI system with constitutional "
-        "principles and hierarchical transparency for regulated industries.</p>"
-        "<p><strong>Deployment:</strong> Production environment, on-premise with cloud monitoring.</p>"
-        "<p><strong>Classification:</strong> High-risk AI system (under EU AI Act Art. 6)</p>"
-        "</div>",
-        unsafe_allow_html=True,
-    )
-
-    # Section 2 -- Agent inventory
-    agent_inventory = [
-        {"Agent": "Code Generator", "Role": "Code Generation", "Risk Level": "Medium", "Status": "Active"},
-        {"Agent": "Security Analyst", "Role": "Security Analysis", "Risk Level": "High", "Status": "Active"},
-        {"Agent": "Code Reviewer", "Role": "Code Review", "Risk Level": "Medium", "Status": "Active"},
-        {"Agent": "Test Generator", "Role": "Test Generation", "Risk Level": "Low", "Status": "Active"},
-        {"Agent": "Risk Manager", "Role": "Risk Assessment", "Risk Level": "High", "Status": "Active"},
-        {"Agent": "Compliance Officer", "Role": "Compliance Checking", "Risk Level": "Critical", "Status": "Active"},
-    ]
-    st.markdown(
-        '<div class="report-section"><h4>2. Agent Inventory</h4></div>',
+        SECTION_HEADERS["overview"] + SECTION_HEADERS["agents"],
         unsafe_allow_html=True,
     )
-    st.dataframe(pd.DataFrame(agent_inventory), use_container_width=True, hide_index=True)
+    st.dataframe(_agent_inventory_table(), use_container_width=True, hide_index=True)
 
     # Section 3 -- Decision summary
-    st.markdown(
-        '<div class="report-section"><h4>3. Decision Summary</h4></div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown(SECTION_HEADERS["decisions"], unsafe_allow_html=True)
     ds1, ds2, ds3, ds4 = st.columns(4)
     ds1.metric("Total Decisions", total_decisions)
     ds2.metric("Average Confidence", f"{avg_confidence:.0%}")
-    ds3.metric("Safe Outcomes", f"{safe_count / total_decisions:.0%}")
+    ds3.metric("Safe Outcomes", safe_pct_str)
     ds4.metric("Human Interventions", intervention_count)
 
     # Decision breakdown chart
-    fig_dec = go.Figure(data=[go.Pie(
-        labels=["Safe", "Warning", "Critical"],
-        values=[safe_count, warning_count, critical_count],
-        marker=dict(colors=["#10b981", "#f59e0b", "#ef4444"]),
-        hole=0.4,
-    )])
-    fig_dec.update_layout(height=250, margin=dict(l=0, r=0, t=10, b=0))
-    st.plotly_chart(fig_dec, use_container_width=True)
+    st.plotly_chart(
+        build_decision_pie(safe_count, warning_count, critical_count),
+        use_container_width=True,
+    )
+
+    # Partition the entries for sections 4, 5 and the report payload in one pass
+    incidents, interventions, incident_payload = [], [], []
+    for e in entries:
+        status = e["safety_status"]
+        if status in INCIDENT_LEVELS:
+            incidents.append(e)
+            incident_payload.append({"id": e["id"], "task": e["task"], "severity": status})
+        if e["human_intervention"]:
+            interventions.append(e)
 
     # Section 4 -- Safety incidents
-    st.markdown(
-        '<div class="report-section"><h4>4. Safety Incidents</h4></div>',
-        unsafe_allow_html=True,
-    )
-    incidents = [e for e in entries if e["safety_status"] in ("Warning", "Critical")]
+    st.markdown(SECTION_HEADERS["incidents"], unsafe_allow_html=True)
     if incidents:
-        inc_rows = []
-        for e in incidents:
-            inc_rows.append({
-                "ID": e["id"],
-                "Timestamp": e["timestamp"],
-                "Task": e["task"],
-                "Severity": e["safety_status"],
-                "Decision": e["decision"],
-                "Resolved": "Yes",
-            })
-        st.dataframe(pd.DataFrame(inc_rows), use_container_width=True, hide_index=True)
+        inc_df = pd.DataFrame({
+            "ID": [e["id"] for e in incidents],
+            "Timestamp": [e["timestamp"] for e in incidents],
+            "Task": [e["task"] for e in incidents],
+            "Severity": [e["safety_status"] for e in incidents],
+            "Decision": [e["decision"] for e in incidents],
+            "Resolved": "Yes",
+        })
+        st.dataframe(inc_df, use_container_width=True, hide_index=True)
     else:
         st.success("No safety incidents recorded in the reporting period.")
 
     # Section 5 -- Intervention log
-    st.markdown(
-        '<div class="report-section"><h4>5. Human Intervention Log</h4></div>',
-        unsafe_allow_html=True,
-    )
-    interventions = [e for e in entries if e["human_intervention"]]
+    st.markdown(SECTION_HEADERS["interventions"], unsafe_allow_html=True)
     if interventions:
-        int_rows = []
-        for e in interventions:
-            int_rows.append({
-                "ID": e["id"],
-                "Timestamp": e["timestamp"],
-                "Task": e["task"],
-                "Agents": ", ".join(e["agents"]),
-                "Reason": "Confidence below threshold" if e["confidence"] < 0.85 else "Policy escalation",
-                "Outcome": e["decision"],
-            })
-        st.dataframe(pd.DataFrame(int_rows), use_container_width=True, hide_index=True)
+        confidences = np.array([e["confidence"] for e in interventions])
+        int_df = pd.DataFrame({
+            "ID": [e["id"] for e in interventions],
+            "Timestamp": [e["timestamp"] for e in interventions],
+            "Task": [e["task"] for e in interventions],
+            "Agents": [", ".join(e["agents"]) for e in interventions],
+            "Reason": np.where(confidences < 0.85, "Confidence below threshold", "Policy escalation"),
+            "Outcome": [e["decision"] for e in interventions],
+        })
+        st.dataframe(int_df, use_container_width=True, hide_index=True)
     else:
         st.info("No human interventions recorded in the reporting period.")
 
     # Section 6 -- Compliance category scores
-    st.markdown(
-        '<div class="report-section"><h4>6. Compliance Attestation</h4></div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown(SECTION_HEADERS["attestation"], unsafe_allow_html=True)
 
-    cat_data = []
-    for cat, info in rpt_data["categories"].items():
-        status_label = {"safe": "Compliant", "warning": "Needs Attention", "critical": "Non-Compliant"}[info["status"]]
-        cat_data.append({
-            "Category": cat,
-            "Score": f"{info['score']}%",
-            "Status": status_label,
-        })
-    st.dataframe(pd.DataFrame(cat_data), use_container_width=True, hide_index=True)
+    st.dataframe(_category_table(rpt_fw), use_container_width=True, hide_index=True)
 
     st.markdown(
         f"<p style='margin-top:1rem;'><strong>Overall {rpt_fw} Compliance Score: "
@@ -896,7 +1176,7 @@ with tab4:
         unsafe_allow_html=True,
     )
 
-    non_compliant = [c for c, i in rpt_data["categories"].items() if i["status"] in ("warning", "critical")]
+    non_compliant = [c for c, i in rpt_data["categories"].items() if i["status"] in FLAGGED_STATUSES]
     if non_compliant:
         st.warning(
             f"Action required in {len(non_compliant)} categories: {', '.join(non_compliant)}"
@@ -906,52 +1186,30 @@ with tab4:
 
     st.divider()
 
-    # Build downloadable report (JSON)
-    report_payload = {
-        "report_title": f"{rpt_fw} Compliance Report",
-        "framework": rpt_fw,
-        "full_name": rpt_data["full_name"],
-        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "reporting_period": report_period,
-        "system": "CoHumAIn Multi-Agent Framework v2.1",
-        "overall_score": rpt_data["overall"],
-        "categories": {
-            cat: {"score": info["score"], "status": info["status"]}
-            for cat, info in rpt_data["categories"].items()
-        },
-        "decision_summary": {
-            "total": total_decisions,
-            "avg_confidence": round(avg_confidence, 2),
-            "safe": safe_count,
-            "warning": warning_count,
-            "critical": critical_count,
-            "human_interventions": intervention_count,
-        },
-        "agent_inventory": agent_inventory,
-        "safety_incidents": [
-            {"id": e["id"], "task": e["task"], "severity": e["safety_status"]}
-            for e in incidents
-        ],
-        "attestation": (
-            f"This report certifies that the CoHumAIn system has been evaluated "
-            f"against {rpt_fw} ({rpt_data['full_name']}) requirements. "
-            f"Overall compliance score: {rpt_data['overall']}%. "
-            f"Generated automatically on {datetime.now().strftime('%Y-%m-%d')}."
-        ),
-    }
+    # Downloadable report (JSON); stamped and encoded only when requested. The
+    # body is cached per framework/period, so regenerating it is cheap.
+    if st.button("📄 Generate Report", use_container_width=True):
+        report_payload = build_report_payload(
+            rpt_fw,
+            report_period,
+            summary,
+            incident_payload,
+        )
+        st.download_button(
+            "📥 Download Full Report (JSON)",
+            _report_json(report_payload),
+            file_name=f"cohumain_{rpt_fw.lower().replace(' ', '_')}_report.json",
+            mime="application/json",
+            use_container_width=True,
+        )
 
-    st.download_button(
-        "📥 Download Full Report (JSON)",
-        json.dumps(report_payload, indent=2),
-        file_name=f"cohumain_{rpt_fw.lower().replace(' ', '_')}_report.json",
-        mime="application/json",
-        use_container_width=True,
-    )
 
 # ===================================================================
 # TAB 5 -- Stakeholder Views
 # ===================================================================
-with tab5:
+@st.fragment
+def _render_tab5():
+    """Tab 5: compliance and audit data at stakeholder-specific depth."""
     st.subheader("Stakeholder Views")
     st.markdown(
         "Toggle between perspectives to see compliance and audit data at different "
@@ -960,9 +1218,9 @@ with tab5:
 
     view_choice = st.radio(
         "Select Perspective",
-        ["Developer", "Auditor", "Regulator", "End User"],
+        VIEW_CHOICES,
         horizontal=True,
-        index=["Developer", "Auditor", "Regulator", "End User"].index(VIEW),
+        index=VIEW_INDEX.get(VIEW, 0),
         key="tab5_view",
     )
 
@@ -991,35 +1249,31 @@ with tab5:
             st.markdown(f"**Safety Status:** `{demo_entry['safety_status']}`")
 
             st.markdown("**Full Reasoning (raw):**")
-            for i, r in enumerate(demo_entry["reasoning"]):
-                st.code(f"[Step {i+1}] {r}", language="text")
+            st.code(
+                "\n".join(
+                    f"[Step {i}] {r}" for i, r in enumerate(demo_entry["reasoning"], 1)
+                ),
+                language="text",
+            )
 
             st.markdown("**Data Sources:**")
-            for ds in demo_entry["data_sources"]:
-                st.code(ds, language="text")
+            st.code("\n".join(demo_entry["data_sources"]), language="text")
 
             st.markdown("**Raw Entry JSON:**")
-            st.json(demo_entry)
+            st.code(_demo_entry_json(demo_entry["id"], demo_entry), language="json")
 
         with sv2:
             st.markdown("#### Compliance API Response")
-            st.json({
-                "framework": fw_key_sv,
-                "overall_score": fw_sv["overall"],
-                "categories": fw_sv["categories"],
-                "timestamp": datetime.now().isoformat(),
-                "api_version": "v2.1",
-            })
+            st.code(
+                _dumps(dict(
+                    _api_response_spec(fw_key_sv),
+                    timestamp=datetime.now().isoformat(),
+                )).decode(),
+                language="json",
+            )
 
             st.markdown("#### System Configuration")
-            st.json({
-                "confidence_threshold": 0.80,
-                "delegation_strategy": "weighted_voting",
-                "constitutional_check": True,
-                "max_retries": 3,
-                "timeout_seconds": 60,
-                "audit_logging": "verbose",
-            })
+            st.code(SYSTEM_CONFIG_JSON, language="json")
 
     # ----- AUDITOR VIEW -----
     elif view_choice == "Auditor":
@@ -1033,17 +1287,18 @@ with tab5:
         with sv1:
             st.markdown(f"#### {fw_key_sv} Compliance Summary")
 
-            for cat, info in fw_sv["categories"].items():
-                icon = {"safe": "🟢", "warning": "🟡", "critical": "🔴"}[info["status"]]
-                label = {"safe": "Compliant", "warning": "Needs Attention", "critical": "Non-Compliant"}[info["status"]]
-                st.markdown(f"{icon} **{cat}** -- {info['score']}% ({label})")
+            st.markdown("\n\n".join(
+                f"{STATUS_ICON[info['status']]} **{cat}** -- {info['score']}% "
+                f"({STATUS_LABEL[info['status']]})"
+                for cat, info in fw_sv["categories"].items()
+            ))
 
             st.divider()
 
             st.markdown("#### Audit Trail Summary")
             st.metric("Decisions Audited", total_decisions)
             st.metric("Decisions with Human Review", intervention_count)
-            st.metric("Safety Incidents", warning_count + critical_count)
+            st.metric("Safety Incidents", summary.incident_count)
 
         with sv2:
             st.markdown("#### Evidence of Compliance")
@@ -1089,7 +1344,7 @@ with tab5:
                 "Overall Compliance": f"{fw_sv['overall']}%",
                 "Open Non-Conformities": len([
                     c for c, i in fw_sv["categories"].items()
-                    if i["status"] in ("warning", "critical")
+                    if i["status"] in FLAGGED_STATUSES
                 ]),
                 "Critical Safety Events": critical_count,
                 "Human Override Capability": "Enabled",
@@ -1101,17 +1356,10 @@ with tab5:
 
             st.markdown("#### Safety Incident Summary")
 
-            fig_safety = go.Figure(data=[go.Bar(
-                x=["Safe", "Warning", "Critical"],
-                y=[safe_count, warning_count, critical_count],
-                marker_color=["#10b981", "#f59e0b", "#ef4444"],
-            )])
-            fig_safety.update_layout(
-                yaxis_title="Count",
-                height=250,
-                margin=dict(l=0, r=0, t=10, b=0),
+            st.plotly_chart(
+                build_safety_bar(safe_count, warning_count, critical_count),
+                use_container_width=True,
             )
-            st.plotly_chart(fig_safety, use_container_width=True)
 
         with sv2:
             st.markdown("#### Non-Compliant Categories")
@@ -1119,18 +1367,19 @@ with tab5:
             flagged = [
                 (cat, info)
                 for cat, info in fw_sv["categories"].items()
-                if info["status"] in ("warning", "critical")
+                if info["status"] in FLAGGED_STATUSES
             ]
             if flagged:
-                for cat, info in flagged:
-                    severity = "WARNING" if info["status"] == "warning" else "CRITICAL"
-                    css = "compliance-warning" if info["status"] == "warning" else "compliance-critical"
-                    st.markdown(
-                        f'<div class="{css}"><strong>[{severity}] {cat}</strong><br/>'
+                st.markdown(
+                    "".join(
+                        f'<div class="{STATUS_CSS[info["status"]]}">'
+                        f'<strong>[{info["status"].upper()}] {cat}</strong><br/>'
                         f"Score: {info['score']}% -- Below required threshold.<br/>"
-                        f"Remediation plan required.</div>",
-                        unsafe_allow_html=True,
-                    )
+                        f"Remediation plan required.</div>"
+                        for cat, info in flagged
+                    ),
+                    unsafe_allow_html=True,
+                )
             else:
                 st.success("All categories meet compliance thresholds.")
 
@@ -1215,5 +1464,27 @@ with tab5:
         st.markdown("#### Recent System Performance")
         eu_cols = st.columns(3)
         eu_cols[0].metric("Decisions Made", total_decisions)
-        eu_cols[1].metric("Safety Rating", f"{safe_count/total_decisions:.0%}")
+        eu_cols[1].metric("Safety Rating", safe_pct_str)
         eu_cols[2].metric("Human Reviews", intervention_count)
+
+
+# ---------------------------------------------------------------------------
+# Tabs -- each tab body is a fragment, so its widgets only rerun that tab
+# ---------------------------------------------------------------------------
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    "📊 Compliance Dashboard",
+    "📜 Audit Trail",
+    "🔗 Decision Provenance",
+    "📄 Regulatory Reports",
+    "👥 Stakeholder Views",
+])
+with tab1:
+    _render_tab1()
+with tab2:
+    _render_tab2()
+with tab3:
+    _render_tab3()
+with tab4:
+    _render_tab4()
+with tab5:
+    _render_tab5()
@@ -3,9 +3,36 @@ CoHumAIn Framework - Finance Domain Example
 Trading agent team with regulatory compliance for SEC/MiFID II
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+from dataclasses import dataclass
 import time
+import numpy as np
 from cohumain.framework import CoHumAInFramework, Agent
+from cohumain.types import _SLOTS
+
+
+@dataclass(frozen=True, **_SLOTS)
+class SecurityAnalysis:
+    """Market analysis result for a single security"""
+    ticker: str
+    timeframe: str
+    technical_indicators: Dict[str, Any]
+    sentiment: str
+    recommendation: str
+    target_price: float
+    confidence: float
+
+
+@dataclass(frozen=True, **_SLOTS)
+class RiskAssessment:
+    """Risk metrics for a single proposed trade"""
+    position_size_percent: float
+    max_drawdown_risk: float
+    portfolio_correlation: float
+    volatility: float
+    risk_score: float  # 0-1 scale
+    approved: bool
+    concerns: Tuple[str, ...]
 
 
 class MarketAnalyst(Agent):
@@ -34,33 +61,30 @@ class MarketAnalyst(Agent):
         Returns Level 1 explanation with market analysis
         """
         # Simplified analysis - real implementation would use market data APIs
-        analysis = {
-            "ticker": ticker,
-            "timeframe": timeframe,
-            "technical_indicators": {
+        analysis = SecurityAnalysis(
+            ticker=ticker,
+            timeframe=timeframe,
+            technical_indicators={
                 "RSI": 65.2,
                 "MACD": "Bullish",
                 "Moving_Avg_50": "Above",
                 "Volume": "Above Average"
             },
-            "sentiment": "Positive",
-            "recommendation": "BUY",
-            "target_price": 185.00,
-            "confidence": 0.87
-        }
+            sentiment="Positive",
+            recommendation="BUY",
+            target_price=185.00,
+            confidence=0.87
+        )
         
-        reasoning = self.generate_reasoning_trace(
+        return self.generate_reasoning_trace(
             task=f"Analyze {ticker} for {timeframe}",
-            context={"analysis": analysis}
+            context={"analysis": analysis},
+            extra={
+                "analysis": analysis,
+                "data_sources": ["Market Data API", "News Sentiment API"],
+                "assumptions": ["Historical patterns continue", "No major events"]
+            }
         )
-        
-        reasoning.update({
-            "analysis": analysis,
-            "data_sources": ["Market Data API", "News Sentiment API"],
-            "assumptions": ["Historical patterns continue", "No major events"]
-        })
-        
-        return reasoning
 
 
 class RiskManager(Agent):
@@ -91,35 +115,55 @@ class RiskManager(Agent):
         """
         # Simplified risk calculation
         position_size_pct = (trade.get("value", 0) / portfolio.get("total_value", 1)) * 100
+        return self._explain_trade_risk(trade, position_size_pct, position_size_pct <= 10)
+    
+    def assess_trades_bulk(self, trades: List[Dict[str, Any]], portfolio: Dict) -> List[Dict[str, Any]]:
+        """
+        Assess risk of a batch of proposed trades
         
-        risk_assessment = {
-            "position_size_percent": position_size_pct,
-            "max_drawdown_risk": 0.05,
-            "portfolio_correlation": 0.3,
-            "volatility": 0.18,
-            "risk_score": 0.25,  # 0-1 scale
-            "approved": position_size_pct <= 10 and True,
-            "concerns": []
-        }
+        Position sizing and the 10% limit check run once over the whole batch;
+        each trade still gets its own Level 1 explanation.
+        """
+        values = np.fromiter((t.get("value", 0) for t in trades), dtype=float, count=len(trades))
+        position_sizes = values / portfolio.get("total_value", 1) * 100
+        approved = position_sizes <= 10
+        return [
+            self._explain_trade_risk(trade, size, ok)
+            for trade, size, ok in zip(trades, position_sizes.tolist(), approved.tolist())
+        ]
+    
+    def _explain_trade_risk(
+        self, trade: Dict[str, Any], position_size_pct: float, approved: bool
+    ) -> Dict[str, Any]:
+        """Build the risk assessment and reasoning trace for one sized trade"""
+        volatility = 0.18
         
-        if position_size_pct > 10:
-            risk_assessment["concerns"].append("Position size exceeds 10% limit")
+        concerns = []
+        if not approved:
+            concerns.append("Position size exceeds 10% limit")
         
-        if risk_assessment["volatility"] > 0.25:
-            risk_assessment["concerns"].append("High volatility detected")
+        if volatility > 0.25:
+            concerns.append("High volatility detected")
         
-        reasoning = self.generate_reasoning_trace(
-            task=f"Assess risk for {trade.get('ticker')} trade",
-            context={"risk_assessment": risk_assessment}
+        risk_assessment = RiskAssessment(
+            position_size_percent=position_size_pct,
+            max_drawdown_risk=0.05,
+            portfolio_correlation=0.3,
+            volatility=volatility,
+            risk_score=0.25,
+            approved=approved,
+            concerns=tuple(concerns)
         )
         
-        reasoning.update({
-            "risk_assessment": risk_assessment,
-            "portfolio_impact": f"{position_size_pct:.2f}% of portfolio",
-            "risk_limits": self.constitutional_principles
-        })
-        
-        return reasoning
+        return self.generate_reasoning_trace(
+            task=f"Assess risk for {trade.get('ticker')} trade",
+            context={"risk_assessment": risk_assessment},
+            extra={
+                "risk_assessment": risk_assessment,
+                "portfolio_impact": f"{position_size_pct:.2f}% of portfolio",
+                "risk_limits": self.constitutional_principles
+            }
+        )
 
 
 class ComplianceOfficer(Agent):
@@ -166,18 +210,15 @@ class ComplianceOfficer(Agent):
             "compliance_score": 1.0
         }
         
-        reasoning = self.generate_reasoning_trace(
+        return self.generate_reasoning_trace(
             task=f"Compliance check for {trade.get('ticker')} trade",
-            context={"compliance": compliance_check}
+            context={"compliance": compliance_check},
+            extra={
+                "compliance_check": compliance_check,
+                "regulations_checked": ["SEC", "MiFID II", "Insider Trading"],
+                "audit_trail_id": f"AUDIT_{trade.get('ticker')}_{int(time.time())}"
+            }
         )
-        
-        reasoning.update({
-            "compliance_check": compliance_check,
-            "regulations_checked": ["SEC", "MiFID II", "Insider Trading"],
-            "audit_trail_id": f"AUDIT_{trade.get('ticker')}_{int(time.time())}"
-        })
-        
-        return reasoning
 
 
 class TradeExecutor(Agent):
@@ -3,33 +3,81 @@ CoHumAIn Framework - Healthcare Domain Example
 Multi-specialist diagnostic team with HIPAA compliance
 """
 
-from typing import Dict, List, Any
-import sys
-from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+try:
+    import cohumain  # noqa: F401
+except ImportError:
+    # Running from a source checkout without ``pip install -e .``
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
 from cohumain.framework import CoHumAInFramework, Agent
+from cohumain.types import _SLOTS
+
+
+@dataclass(frozen=True, **_SLOTS)
+class ImagingAnalysis:
+    """Radiology read of a single imaging study"""
+    imaging_type: str
+    quality: str
+    key_findings: Tuple[str, ...]
+    abnormalities: Tuple[str, ...]
+    recommendation: str
+    confidence: float
+    requires_human_review: bool
+
+
+@dataclass(frozen=True, **_SLOTS)
+class PathologyAnalysis:
+    """Pathology read of a single specimen"""
+    sample_type: str
+    specimen_quality: str
+    microscopic_findings: Tuple[str, ...]
+    cell_characteristics: Dict[str, str]
+    biomarkers: Dict[str, str]
+    diagnosis: str
+    differential_diagnosis: Tuple[str, ...]
+    confidence: float
+
+
+@dataclass(frozen=True, **_SLOTS)
+class GeneticsAnalysis:
+    """Interpretation of a single genetic test"""
+    test_type: str
+    mutations_detected: Tuple[str, ...]
+    risk_assessment: str
+    hereditary_implications: str
+    pharmacogenomic_impact: str
+    confidence: float
+    genetic_counseling_required: bool
 
 
 class Radiologist(Agent):
     """Radiologist agent for medical imaging analysis"""
     
+    __slots__ = ()
+    
+    CAPABILITIES = ("Medical Imaging", "CT Scan Analysis", "MRI Analysis", "X-Ray Analysis")
+    CONSTITUTIONAL_PRINCIPLES = (
+        "Patient safety is paramount",
+        "HIPAA compliance mandatory",
+        "Never diagnose without sufficient image quality",
+        "Always recommend human radiologist review for critical findings",
+        "Document all limitations and uncertainties",
+    )
+    
     def __init__(self, name: str = "Radiologist AI", expertise: float = 0.94):
         super().__init__(
             name=name,
             role="Radiologist",
             expertise=expertise,
             confidence_threshold=0.90,
-            capabilities=["Medical Imaging", "CT Scan Analysis", "MRI Analysis", "X-Ray Analysis"],
-            constitutional_principles=[
-                "Patient safety is paramount",
-                "HIPAA compliance mandatory",
-                "Never diagnose without sufficient image quality",
-                "Always recommend human radiologist review for critical findings",
-                "Document all limitations and uncertainties"
-            ],
+            capabilities=list(self.CAPABILITIES),
+            constitutional_principles=list(self.CONSTITUTIONAL_PRINCIPLES),
             max_retries=2,
             timeout=180
         )
@@ -41,49 +89,51 @@ class Radiologist(Agent):
         Returns Level 1 explanation with imaging analysis
         """
         # Simplified analysis - real implementation would use medical imaging AI
-        analysis = {
-            "imaging_type": imaging_type,
-            "quality": "Diagnostic quality",
-            "key_findings": findings.get("findings", []),
-            "abnormalities": findings.get("abnormalities", []),
-            "recommendation": findings.get("recommendation", "Further evaluation needed"),
-            "confidence": 0.89,
-            "requires_human_review": True  # Always for clinical decisions
-        }
+        analysis = ImagingAnalysis(
+            imaging_type=imaging_type,
+            quality="Diagnostic quality",
+            key_findings=tuple(findings.get("findings", ())),
+            abnormalities=tuple(findings.get("abnormalities", ())),
+            recommendation=findings.get("recommendation", "Further evaluation needed"),
+            confidence=0.89,
+            requires_human_review=True  # Always for clinical decisions
+        )
         
-        reasoning = self.generate_reasoning_trace(
+        return self.generate_reasoning_trace(
             task=f"Analyze {imaging_type} study",
-            context={"analysis": analysis}
+            context={"analysis": analysis},
+            extra={
+                "clinical_analysis": analysis,
+                "imaging_protocol": f"{imaging_type} standard protocol",
+                "comparison": "No prior studies available",
+                "limitations": ["Single view only", "Limited patient history"],
+                "hipaa_compliance": "PHI anonymized, secure transmission"
+            }
         )
-        
-        reasoning.update({
-            "clinical_analysis": analysis,
-            "imaging_protocol": f"{imaging_type} standard protocol",
-            "comparison": "No prior studies available",
-            "limitations": ["Single view only", "Limited patient history"],
-            "hipaa_compliance": "PHI anonymized, secure transmission"
-        })
-        
-        return reasoning
 
 
 class Pathologist(Agent):
     """Pathologist agent for tissue and lab analysis"""
     
+    __slots__ = ()
+    
+    CAPABILITIES = ("Histopathology", "Lab Analysis", "Tissue Analysis", "Biomarker Analysis")
+    CONSTITUTIONAL_PRINCIPLES = (
+        "Thorough specimen analysis required",
+        "HIPAA compliance mandatory",
+        "Document sample quality and limitations",
+        "Always provide differential diagnosis",
+        "Recommend additional testing when uncertain",
+    )
+    
     def __init__(self, name: str = "Pathologist AI", expertise: float = 0.93):
         super().__init__(
             name=name,
             role="Pathologist",
             expertise=expertise,
             confidence_threshold=0.90,
-            capabilities=["Histopathology", "Lab Analysis", "Tissue Analysis", "Biomarker Analysis"],
-            constitutional_principles=[
-                "Thorough specimen analysis required",
-                "HIPAA compliance mandatory",
-                "Document sample quality and limitations",
-                "Always provide differential diagnosis",
-                "Recommend additional testing when uncertain"
-            ],
+            capabilities=list(self.CAPABILITIES),
+            constitutional_principles=list(self.CONSTITUTIONAL_PRINCIPLES),
             max_retries=2,
             timeout=180
         )
@@ -94,49 +144,51 @@ class Pathologist(Agent):
         
         Returns Level 1 explanation with pathology analysis
         """
-        analysis = {
-            "sample_type": sample_type,
-            "specimen_quality": "Adequate for diagnosis",
-            "microscopic_findings": findings.get("microscopic", []),
-            "cell_characteristics": findings.get("cells", {}),
-            "biomarkers": findings.get("biomarkers", {}),
-            "diagnosis": findings.get("diagnosis", "Pending additional tests"),
-            "differential_diagnosis": findings.get("differential", []),
-            "confidence": 0.91
-        }
+        analysis = PathologyAnalysis(
+            sample_type=sample_type,
+            specimen_quality="Adequate for diagnosis",
+            microscopic_findings=tuple(findings.get("microscopic", ())),
+            cell_characteristics=findings.get("cells", {}),
+            biomarkers=findings.get("biomarkers", {}),
+            diagnosis=findings.get("diagnosis", "Pending additional tests"),
+            differential_diagnosis=tuple(findings.get("differential", ())),
+            confidence=0.91
+        )
         
-        reasoning = self.generate_reasoning_trace(
+        return self.generate_reasoning_trace(
             task=f"Analyze {sample_type} specimen",
-            context={"analysis": analysis}
+            context={"analysis": analysis},
+            extra={
+                "pathology_report": analysis,
+                "staining_methods": ["H&E", "IHC"],
+                "additional_tests_recommended": findings.get("additional_tests", []),
+                "hipaa_compliance": "PHI protected, secure lab protocol"
+            }
         )
-        
-        reasoning.update({
-            "pathology_report": analysis,
-            "staining_methods": ["H&E", "IHC"],
-            "additional_tests_recommended": findings.get("additional_tests", []),
-            "hipaa_compliance": "PHI protected, secure lab protocol"
-        })
-        
-        return reasoning
 
 
 class Geneticist(Agent):
     """Geneticist agent for genetic analysis"""
     
+    __slots__ = ()
+    
+    CAPABILITIES = ("Genomic Analysis", "Mutation Detection", "Risk Assessment", "Pharmacogenomics")
+    CONSTITUTIONAL_PRINCIPLES = (
+        "Protect genetic privacy (GINA compliance)",
+        "HIPAA compliance mandatory",
+        "Provide genetic counseling recommendations",
+        "Document hereditary implications",
+        "Explain uncertainty in genetic predictions",
+    )
+    
     def __init__(self, name: str = "Geneticist AI", expertise: float = 0.91):
         super().__init__(
             name=name,
             role="Geneticist",
             expertise=expertise,
             confidence_threshold=0.88,
-            capabilities=["Genomic Analysis", "Mutation Detection", "Risk Assessment", "Pharmacogenomics"],
-            constitutional_principles=[
-                "Protect genetic privacy (GINA compliance)",
-                "HIPAA compliance mandatory",
-                "Provide genetic counseling recommendations",
-                "Document hereditary implications",
-                "Explain uncertainty in genetic predictions"
-            ],
+            capabilities=list(self.CAPABILITIES),
+            constitutional_principles=list(self.CONSTITUTIONAL_PRINCIPLES),
             max_retries=2,
             timeout=240
         )
@@ -147,48 +199,50 @@ class Geneticist(Agent):
         
         Returns Level 1 explanation with genetic analysis
         """
-        analysis = {
-            "test_type": test_type,
-            "mutations_detected": results.get("mutations", []),
-            "risk_assessment": results.get("risk", "Moderate"),
-            "hereditary_implications": results.get("hereditary", "Family screening recommended"),
-            "pharmacogenomic_impact": results.get("pharma", "Standard dosing applicable"),
-            "confidence": 0.87,
-            "genetic_counseling_required": True
-        }
+        analysis = GeneticsAnalysis(
+            test_type=test_type,
+            mutations_detected=tuple(results.get("mutations", ())),
+            risk_assessment=results.get("risk", "Moderate"),
+            hereditary_implications=results.get("hereditary", "Family screening recommended"),
+            pharmacogenomic_impact=results.get("pharma", "Standard dosing applicable"),
+            confidence=0.87,
+            genetic_counseling_required=True
+        )
         
-        reasoning = self.generate_reasoning_trace(
+        return self.generate_reasoning_trace(
             task=f"Analyze {test_type} genetic test",
-            context={"analysis": analysis}
+            context={"analysis": analysis},
+            extra={
+                "genetic_analysis": analysis,
+                "testing_methodology": f"{test_type} sequencing",
+                "clinical_significance": results.get("significance", "Uncertain"),
+                "privacy_protections": "GINA/HIPAA compliant, encrypted storage"
+            }
         )
-        
-        reasoning.update({
-            "genetic_analysis": analysis,
-            "testing_methodology": f"{test_type} sequencing",
-            "clinical_significance": results.get("significance", "Uncertain"),
-            "privacy_protections": "GINA/HIPAA compliant, encrypted storage"
-        })
-        
-        return reasoning
 
 
 class PrimaryCarePhysician(Agent):
     """Primary care physician agent for holistic patient assessment"""
     
+    __slots__ = ()
+    
+    CAPABILITIES = ("Patient History", "Physical Assessment", "Treatment Planning", "Care Coordination")
+    CONSTITUTIONAL_PRINCIPLES = (
+        "Holistic patient-centered care",
+        "HIPAA compliance mandatory",
+        "Consider patient preferences and values",
+        "Coordinate care across specialists",
+        "Always involve patient in decision-making",
+    )
+    
     def __init__(self, name: str = "Primary Care AI", expertise: float = 0.89):
         super().__init__(
             name=name,
             role="Primary Care Physician",
             expertise=expertise,
             confidence_threshold=0.85,
-            capabilities=["Patient History", "Physical Assessment", "Treatment Planning", "Care Coordination"],
-            constitutional_principles=[
-                "Holistic patient-centered care",
-                "HIPAA compliance mandatory",
-                "Consider patient preferences and values",
-                "Coordinate care across specialists",
-                "Always involve patient in decision-making"
-            ],
+            capabilities=list(self.CAPABILITIES),
+            constitutional_principles=list(self.CONSTITUTIONAL_PRINCIPLES),
             max_retries=3,
             timeout=120
         )
@@ -208,20 +262,17 @@ class PrimaryCarePhysician(Agent):
             "confidence": 0.86
         }
         
-        reasoning = self.generate_reasoning_trace(
+        return self.generate_reasoning_trace(
             task="Synthesize specialist assessments and create treatment plan",
-            context={"diagnosis": diagnosis, "specialists": len(specialist_inputs)}
+            context={"diagnosis": diagnosis, "specialists": len(specialist_inputs)},
+            extra={
+                "integrated_assessment": diagnosis,
+                "specialist_inputs_considered": len(specialist_inputs),
+                "patient_preferences": patient_data.get("preferences", "Standard care"),
+                "coordination_notes": "Scheduled follow-up with all specialists",
+                "hipaa_compliance": "Coordinated care exception documented"
+            }
         )
-        
-        reasoning.update({
-            "integrated_assessment": diagnosis,
-            "specialist_inputs_considered": len(specialist_inputs),
-            "patient_preferences": patient_data.get("preferences", "Standard care"),
-            "coordination_notes": "Scheduled follow-up with all specialists",
-            "hipaa_compliance": "Coordinated care exception documented"
-        })
-        
-        return reasoning
 
 
 def create_diagnostic_team() -> CoHumAInFramework:
@@ -249,9 +300,120 @@ def create_diagnostic_team() -> CoHumAInFramework:
     return framework
 
 
+def _run_specialists(
+    team: CoHumAInFramework,
+    patient_case: Dict,
+    executor: Optional[Executor] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the imaging, pathology and genetics work-ups concurrently
+    
+    The three specialists are independent, so case latency is bounded by the
+    slowest of them rather than their sum. Primary care synthesis depends on
+    all three and runs afterwards.
+    
+    Returns Level 1 explanations keyed by specialist role
+    """
+    agents = {agent.role: agent for agent in team.agents}
+    pool = executor or ThreadPoolExecutor(max_workers=3)
+    try:
+        futures = {
+            "Radiologist": pool.submit(
+                agents["Radiologist"].analyze_imaging,
+                "CT", patient_case.get("imaging_findings", {})
+            ),
+            "Pathologist": pool.submit(
+                agents["Pathologist"].analyze_pathology,
+                "Lymph node biopsy", patient_case.get("pathology_results", {})
+            ),
+            "Geneticist": pool.submit(
+                agents["Geneticist"].analyze_genetics,
+                "FISH", patient_case.get("genetic_results", {})
+            ),
+        }
+        reports = {role: future.result() for role, future in futures.items()}
+    finally:
+        if executor is None:
+            pool.shutdown()
+    
+    reports["Primary Care Physician"] = agents["Primary Care Physician"].synthesize_diagnosis(
+        patient_case, list(reports.values())
+    )
+    return reports
+
+
+# Console report for the example case, rendered with one write per section
+CASE_REPORT_TEMPLATE = """
+{rule}
+COHUMAIN HEALTHCARE EXAMPLE - MULTI-SPECIALIST DIAGNOSIS
+{rule}
+
+Case: {task}
+Safety Status: {status}
+Automation Level: {automation_level}
+Human Review: REQUIRED (always for clinical decisions)
+
+--- SPECIALIST WORK-UP ---{specialist_lines}
+
+--- LEVEL 1: Individual Specialist Assessments ---{level1_lines}
+
+--- LEVEL 2: Care Coordination ---{level2_lines}
+
+--- LEVEL 3: Integrated Clinical Decision Support ---
+
+Collective Diagnostic Confidence: {collective_confidence:.2%}
+Recommendation: {recommendation}
+
+Specialist Contributions:{contribution_lines}
+
+--- HIPAA COMPLIANCE STATUS ---
+✓ PHI encrypted and anonymized
+✓ Access logged for audit trail
+✓ Minimum necessary principle applied
+✓ Secure transmission protocols used
+✓ Patient consent documented
+
+--- CLINICAL DECISION SUPPORT ---
+Working Diagnosis: Suspected follicular lymphoma
+Evidence Strength: HIGH (imaging + pathology + genetics concordant)
+Recommended Actions:
+  1. Hematology-oncology referral (URGENT)
+  2. Complete staging workup
+  3. Flow cytometry confirmation
+  4. Patient education and genetic counseling
+  5. Multidisciplinary tumor board review
+
+--- SAFETY & TRANSPARENCY ---
+Constitutional Compliance: {constitutional_ok}
+Coordination Quality: {coordination_ok}
+Human Oversight: MANDATORY for final decision
+
+{rule}
+
+📋 Generating FDA-compliant Clinical Decision Support Report...
+"""
+
+COMPLIANCE_SUMMARY_TEMPLATE = """
+Report Generated: {generated_at}
+Regulatory Framework: {regulatory_framework}
+Total Assessments: {total_tasks}
+Safety Incidents: {safety_incidents}
+Human Interventions: {interventions_required}
+
+✅ WINDOW OF TRANSPARENCY: Complete diagnostic process with full explainability
+✅ Physicians can understand, trust, and act on AI-assisted diagnosis
+✅ Audit trail available for regulatory compliance and quality assurance
+"""
+
+
 # Example usage
 if __name__ == "__main__":
-    import json
+    import sys
+
+    try:
+        import orjson as json
+    except ImportError:
+        import json
     
     # Create diagnostic team
     diagnostic_team = create_diagnostic_team()
@@ -283,83 +445,50 @@ if __name__ == "__main__":
         "stakes": "high"  # High stakes = maximum oversight
     }
     
-    # Execute diagnostic assessment
-    result = diagnostic_team.execute_task(
-        task="Comprehensive diagnostic assessment for suspected lymphoma",
-        context=patient_case,
-        human_in_loop=True  # ALWAYS required for medical decisions
-    )
-    
-    print("\n" + "="*80)
-    print("COHUMAIN HEALTHCARE EXAMPLE - MULTI-SPECIALIST DIAGNOSIS")
-    print("="*80)
-    
-    print(f"\nCase: {result['task']}")
-    print(f"Safety Status: {result['safety_assessment'].status.value.upper()}")
-    print(f"Automation Level: {result['automation_level']}")
-    print(f"Human Review: REQUIRED (always for clinical decisions)")
-    
-    print("\n--- LEVEL 1: Individual Specialist Assessments ---")
-    for explanation in result['level1_explanations']:
-        print(f"\n{explanation['agent']}:")
-        print(f"  Confidence: {explanation['confidence']:.2%}")
-        print(f"  Finding: {explanation['observation']}")
-    
-    print("\n--- LEVEL 2: Care Coordination ---")
-    if result['level2_explanations']:
-        for coord in result['level2_explanations']:
-            print(f"\nCoordination: {coord.decision_type}")
-            print(f"  Rationale: {coord.rationale}")
-    else:
-        print("Smooth specialist coordination - no conflicts detected")
+    # One pool serves both the specialist work-up and the team assessment
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        specialist_reports = _run_specialists(diagnostic_team, patient_case, executor=pool)
+        
+        # Execute diagnostic assessment
+        result = diagnostic_team.execute_task(
+            task="Comprehensive diagnostic assessment for suspected lymphoma",
+            context=patient_case,
+            human_in_loop=True,  # ALWAYS required for medical decisions
+            executor=pool
+        )
     
-    print("\n--- LEVEL 3: Integrated Clinical Decision Support ---")
     collective = result['level3_explanation']
-    print(f"\nCollective Diagnostic Confidence: {collective.collective_confidence:.2%}")
-    print(f"Recommendation: {collective.recommendation}")
-    print(f"\nSpecialist Contributions:")
-    for specialist, contrib in collective.agent_contributions.items():
-        print(f"  {specialist}: {contrib:.2%}")
-    
-    print("\n--- HIPAA COMPLIANCE STATUS ---")
-    print("✓ PHI encrypted and anonymized")
-    print("✓ Access logged for audit trail")
-    print("✓ Minimum necessary principle applied")
-    print("✓ Secure transmission protocols used")
-    print("✓ Patient consent documented")
-    
-    print("\n--- CLINICAL DECISION SUPPORT ---")
-    print("Working Diagnosis: Suspected follicular lymphoma")
-    print("Evidence Strength: HIGH (imaging + pathology + genetics concordant)")
-    print("Recommended Actions:")
-    print("  1. Hematology-oncology referral (URGENT)")
-    print("  2. Complete staging workup")
-    print("  3. Flow cytometry confirmation")
-    print("  4. Patient education and genetic counseling")
-    print("  5. Multidisciplinary tumor board review")
-    
-    print("\n--- SAFETY & TRANSPARENCY ---")
     safety = result['safety_assessment']
-    print(f"Constitutional Compliance: {len(safety.constitutional_violations) == 0}")
-    print(f"Coordination Quality: {len(safety.coordination_issues) == 0}")
-    print(f"Human Oversight: MANDATORY for final decision")
-    
-    print("\n" + "="*80)
-    print("\n📋 Generating FDA-compliant Clinical Decision Support Report...")
+    sys.stdout.write(CASE_REPORT_TEMPLATE.format_map({
+        "task": result['task'],
+        "status": safety.status.value.upper(),
+        "automation_level": result['automation_level'],
+        "specialist_lines": "".join(
+            f"\n  {role}: {report['confidence']:.2%} confidence"
+            for role, report in specialist_reports.items()
+        ),
+        "level1_lines": "".join(
+            f"\n\n{e['agent']}:\n  Confidence: {e['confidence']:.2%}\n  Finding: {e['observation']}"
+            for e in result['level1_explanations']
+        ),
+        "level2_lines": "".join(
+            f"\n\nCoordination: {c.decision_type}\n  Rationale: {c.rationale}"
+            for c in result['level2_explanations']
+        ) or "\nSmooth specialist coordination - no conflicts detected",
+        "collective_confidence": collective.collective_confidence,
+        "recommendation": collective.recommendation,
+        "contribution_lines": "".join(
+            f"\n  {specialist}: {contrib:.2%}"
+            for specialist, contrib in collective.agent_contributions.items()
+        ),
+        "constitutional_ok": len(safety.constitutional_violations) == 0,
+        "coordination_ok": len(safety.coordination_issues) == 0,
+        "rule": "=" * 80,
+    }))
     
     # Generate compliance report
     compliance_report = diagnostic_team.generate_compliance_report(
         standard="FDA 21 CFR Part 11",
         format="json"
     )
-    
-    report = json.loads(compliance_report)
-    print(f"\nReport Generated: {report['generated_at']}")
-    print(f"Regulatory Framework: {report['regulatory_framework']}")
-    print(f"Total Assessments: {report['total_tasks']}")
-    print(f"Safety Incidents: {report['safety_incidents']}")
-    print(f"Human Interventions: {report['interventions_required']}")
-    
-    print("\n✅ WINDOW OF TRANSPARENCY: Complete diagnostic process with full explainability")
-    print("✅ Physicians can understand, trust, and act on AI-assisted diagnosis")
-    print("✅ Audit trail available for regulatory compliance and quality assurance")
+    sys.stdout.write(COMPLIANCE_SUMMARY_TEMPLATE.format_map(json.loads(compliance_report)))
@@ -4,15 +4,23 @@ Collective Human and Machine Intelligence for Explainable Multi-Agent Systems
 """
 
 from setuptools import setup, find_packages
+from packaging.requirements import Requirement
 from pathlib import Path
 
 # Read README for long description
 this_directory = Path(__file__).parent
 long_description = (this_directory / "README.md").read_text(encoding="utf-8")
 
-# Read requirements
-requirements = (this_directory / "requirements.txt").read_text().splitlines()
-requirements = [req for req in requirements if req and not req.startswith("#")]
+# Read requirements, dropping comments and pip options (-r, -e, ...).
+# Each entry is validated and normalized so malformed lines fail the build here.
+requirements = [
+    str(Requirement(line))
+    for line in (
+        raw.split("#", 1)[0].strip()
+        for raw in (this_directory / "requirements.txt").read_text().splitlines()
+    )
+    if line and not line.startswith("-")
+]
 
 setup(
     name="cohumain",
@@ -51,6 +59,7 @@ setup(
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
             "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.5.0",
             "black>=23.12.0",
             "flake8>=7.0.0",
             "mypy>=1.8.0",
@@ -65,6 +74,7 @@ setup(
             "redis>=5.0.1",
             "prometheus-client>=0.19.0",
             "psycopg2-binary>=2.9.9",
+            "orjson>=3.9.0",
         ],
     },
     entry_points={
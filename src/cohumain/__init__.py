@@ -3,20 +3,25 @@ CoHumAIn Framework
 Collective Human and Machine Intelligence for Explainable Multi-Agent Systems
 """
 
-from cohumain.framework import (
-    CoHumAInFramework,
-    Agent,
-    ExplanationLevel,
-    AutomationLevel,
-    SafetyStatus,
-    CoordinationDecision,
-    CollectiveExplanation,
-    SafetyAssessment,
-)
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Himanshu Joshi, Shivani Shukla"
 
+# Public name -> submodule it lives in. Submodules are imported on first
+# attribute access (PEP 562), so ``import cohumain`` stays cheap.
+_LAZY = {
+    "CoHumAInFramework": "framework",
+    "Agent": "framework",
+    "ExplanationLevel": "types",
+    "AutomationLevel": "types",
+    "SafetyStatus": "types",
+    "CoordinationDecision": "types",
+    "CollectiveExplanation": "types",
+    "SafetyAssessment": "types",
+    "TaskResult": "types",
+}
+
 __all__ = [
     "CoHumAInFramework",
     "Agent",
@@ -26,4 +31,17 @@ __all__ = [
     "CoordinationDecision",
     "CollectiveExplanation",
     "SafetyAssessment",
+    "TaskResult",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_LAZY[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
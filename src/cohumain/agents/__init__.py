@@ -1,2 +1,4 @@
 """CoHumAIn Agent definitions"""
 from cohumain.framework import Agent
+
+__all__ = ["Agent"]
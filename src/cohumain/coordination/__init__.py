@@ -1,2 +1,4 @@
 """CoHumAIn Coordination layer"""
-from cohumain.framework import CoordinationDecision
+from cohumain.types import CoordinationDecision
+
+__all__ = ["CoordinationDecision"]
@@ -1,2 +1,4 @@
 """CoHumAIn Explanation layer"""
-from cohumain.framework import ExplanationLevel, CollectiveExplanation
+from cohumain.types import ExplanationLevel, CollectiveExplanation
+
+__all__ = ["ExplanationLevel", "CollectiveExplanation"]
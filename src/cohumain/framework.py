@@ -3,37 +3,91 @@ CoHumAIn Framework - Core Implementation
 Collective Human and Machine Intelligence for Explainable Multi-Agent Systems
 """
 
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Deque, NamedTuple, TYPE_CHECKING
+from concurrent.futures import Executor
+from functools import lru_cache
+from dataclasses import dataclass, field, asdict, is_dataclass, replace
+from collections import OrderedDict, deque
 from enum import Enum
+import asyncio
+import bisect
+import hashlib
+import heapq
 import time
 from datetime import datetime
 import json
-import pandas as pd
+import numpy as np
 
+# Re-exported so existing ``from cohumain.framework import ...`` keeps working
+from cohumain.types import (  # noqa: F401
+    ExplanationLevel,
+    AutomationLevel,
+    SafetyStatus,
+    CoordinationDecision,
+    CollectiveExplanation,
+    SafetyAssessment,
+    TaskResult,
+    _SLOTS,
+)
 
-class ExplanationLevel(Enum):
-    """Three levels of explanation in CoHumAIn framework"""
-    INDIVIDUAL = 1  # Agent-level reasoning
-    COORDINATION = 2  # Inter-agent delegation and conflict resolution
-    COLLECTIVE = 3  # Team-level emergent behavior
+if TYPE_CHECKING:  # pandas is imported on first use of the performance summary
+    import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used as a fallback
+    orjson = None
 
-class AutomationLevel(Enum):
-    """Human oversight levels"""
-    IN_THE_LOOP = "in_loop"  # Human approves each decision
-    ON_THE_LOOP = "on_loop"  # Human monitors with intervention capability
-    OUT_OF_THE_LOOP = "out_loop"  # Autonomous with logging
 
+def _json_default(obj: Any) -> Any:
+    """Encode framework enums and dataclasses for JSON reports"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
-class SafetyStatus(Enum):
-    """Safety status indicators"""
-    SAFE = "safe"
-    WARNING = "warning"
-    CRITICAL = "critical"
 
+# Principle-check results kept across all agents
+PRINCIPLE_CACHE_SIZE = 256
+# execute_task results kept per framework when cache_result=True
+EXECUTION_CACHE_SIZE = 128
+# Contract-Net award score: bid confidence minus this much per estimated second
+BID_TIME_PENALTY = 0.1
+# Safety modes that award delegations by Contract-Net bidding
+CONTRACT_NET_MODES = frozenset({"balanced", "strict"})
+# Best-placed delegates ranked once per coordination pass
+DELEGATE_SHORTLIST_SIZE = 4
+# Task results kept in CoHumAInFramework.task_history by default
+DEFAULT_HISTORY_CAP = 10_000
+# Columns of get_agent_performance_summary
+PERFORMANCE_COLUMNS = ["Agent", "Role", "Expertise", "Tasks", "Avg Confidence", "Accuracy"]
 
-@dataclass
+
+def _default_performance_metrics() -> Dict[str, float]:
+    return {
+        "accuracy": 0.0,
+        "avg_confidence": 0.0,
+        "tasks_completed": 0
+    }
+
+
+@lru_cache(maxsize=PRINCIPLE_CACHE_SIZE)
+def _evaluate_principles(task: str, principles: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Principles ``task`` violates; pure, so the LRU is safe to share across threads"""
+    violations = []
+    
+    # Simplified principle checking
+    for principle in principles:
+        # In real implementation, use LLM to check principle compliance
+        satisfied = True  # Placeholder
+        if not satisfied:
+            violations.append(principle)
+    
+    return tuple(violations)
+
+
+@dataclass(**_SLOTS)
 class Agent:
     """Individual agent in the multi-agent system"""
     name: str
@@ -44,35 +98,80 @@ class Agent:
     constitutional_principles: List[str]
     max_retries: int = 3
     timeout: int = 60
+    # Per-instance state, excluded from __init__, repr and equality
+    task_history: List[Dict] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    performance_metrics: Dict[str, float] = field(
+        default_factory=_default_performance_metrics, init=False, repr=False, compare=False
+    )
     
-    def __post_init__(self):
-        self.task_history: List[Dict] = []
-        self.performance_metrics: Dict[str, float] = {
-            "accuracy": 0.0,
-            "avg_confidence": 0.0,
-            "tasks_completed": 0
-        }
-    
-    def generate_reasoning_trace(self, task: str, context: Dict) -> Dict[str, Any]:
+    def generate_reasoning_trace(
+        self,
+        task: str,
+        context: Dict,
+        extra: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Generate Level 1 (Individual) explanation
         Extends ReAct with safety-aware reasoning
+        
+        Domain-specific fields in ``extra`` are merged into the trace.
+        ``timestamp`` lets a caller stamp every trace of one task alike.
         """
+        principle_check = self._check_principles(task)
         reasoning = {
             "agent": self.name,
             "task": task,
             "thought": f"Analyzing task: {task}",
             "action": "Execute primary capability",
             "observation": "Task completed",
-            "confidence": self._calculate_confidence(task, context),
-            "constitutional_check": self._check_principles(task),
-            "timestamp": datetime.now().isoformat()
+            "confidence": self._calculate_confidence(task, context, principle_check),
+            "constitutional_check": principle_check,
+            "timestamp": timestamp or datetime.now().isoformat()
         }
+        if extra:
+            reasoning |= extra
         
         self.task_history.append(reasoning)
         return reasoning
     
-    def _calculate_confidence(self, task: str, context: Dict) -> float:
+    async def generate_reasoning_trace_async(
+        self,
+        task: str,
+        context: Dict,
+        extra: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``generate_reasoning_trace``
+        
+        Runs the synchronous trace in a worker thread; agents backed by an
+        async LLM client can override this to await the client directly.
+        """
+        return await asyncio.to_thread(
+            self.generate_reasoning_trace, task, context, extra, timestamp
+        )
+    
+    def bid(self, task: str, context: Dict) -> Dict[str, float]:
+        """
+        Contract-Net bid for a delegated task
+        
+        Returns the agent's task-specific confidence and estimated duration
+        """
+        return {
+            "confidence": self._calculate_confidence(task, context),
+            # In real implementation, estimate from the agent's backend latency
+            "estimatedSeconds": 0.0
+        }
+    
+    def _calculate_confidence(
+        self,
+        task: str,
+        context: Dict,
+        principle_check: Optional[Dict[str, Any]] = None
+    ) -> float:
         """Calculate agent's confidence for this task"""
         # Simplified confidence calculation
         base_confidence = self.expertise
@@ -82,64 +181,37 @@ class Agent:
             base_confidence *= 0.9
         
         # Adjust based on constitutional alignment
-        if not self._check_principles(task)["all_satisfied"]:
+        if principle_check is None:
+            principle_check = self._check_principles(task)
+        if not principle_check["all_satisfied"]:
             base_confidence *= 0.8
         
         return min(base_confidence, 1.0)
     
     def _check_principles(self, task: str) -> Dict[str, Any]:
-        """Check constitutional principles compliance"""
-        violations = []
-        
-        # Simplified principle checking
-        for principle in self.constitutional_principles:
-            # In real implementation, use LLM to check principle compliance
-            satisfied = True  # Placeholder
-            if not satisfied:
-                violations.append(principle)
+        """
+        Check constitutional principles compliance
         
+        Evaluations are cached, but each call gets its own dict and lists so
+        traces never share mutable state.
+        """
+        principles = tuple(self.constitutional_principles)
+        violations = _evaluate_principles(task, principles)
         return {
             "all_satisfied": len(violations) == 0,
-            "violations": violations,
-            "principles_checked": self.constitutional_principles
+            "violations": list(violations),
+            "principles_checked": list(principles)
         }
 
 
-@dataclass
-class CoordinationDecision:
-    """Level 2 (Coordination) explanation"""
-    decision_type: str  # "delegation", "conflict_resolution", "information_sharing"
-    from_agent: str
-    to_agent: Optional[str]
-    rationale: str
-    delegation_reason: Optional[str] = None
-    conflict_resolution_strategy: Optional[str] = None
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-
-
-@dataclass
-class CollectiveExplanation:
-    """Level 3 (Collective) explanation"""
-    task: str
-    agent_contributions: Dict[str, float]
-    emergent_behaviors: List[str]
-    temporal_timeline: List[Dict]
-    counterfactuals: List[str]
-    collective_confidence: float
-    recommendation: str
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-
-
-@dataclass
-class SafetyAssessment:
-    """Safety-aware attribution results"""
-    status: SafetyStatus
-    constitutional_violations: List[Dict]
-    coordination_issues: List[str]
-    emergent_risks: List[str]
-    responsible_agents: Dict[str, float]  # Agent name -> responsibility score
-    intervention_required: bool
-    intervention_reason: Optional[str] = None
+class Level1Aggregate(NamedTuple):
+    """Figures the Level 2/3 steps need, gathered from Level 1 in one pass"""
+    confidences: np.ndarray
+    weights: np.ndarray
+    confidence_spread: float
+    violations: List[Dict]
+    timeline: List[Dict]
+    delegation_candidates: List[Dict]  # explanations below the confidence threshold
 
 
 class CoHumAInFramework:
@@ -153,16 +225,40 @@ class CoHumAInFramework:
         domain: str = "general",
         safety_mode: str = "balanced",
         regulatory_framework: Optional[str] = None,
-        stakeholder_type: str = "developer"
+        stakeholder_type: str = "developer",
+        history_cap: Optional[int] = DEFAULT_HISTORY_CAP,
+        archiver: Optional[Callable[[Dict[str, Any]], None]] = None
     ):
+        """
+        ``history_cap`` bounds ``task_history`` (None keeps everything); when
+        the oldest result is evicted it is passed to ``archiver`` if given.
+        """
         self.domain = domain
         self.safety_mode = safety_mode
         self.regulatory_framework = regulatory_framework
         self.stakeholder_type = stakeholder_type
         
         self.agents: List[Agent] = []
+        # Agents ordered by descending expertise (ties keep insertion order),
+        # with the matching sort keys for bisect
+        self._agents_by_expertise: List[Agent] = []
+        self._expertise_keys: List[float] = []
+        # Agent name -> first registered agent with that name
+        self._agent_index: Dict[str, Agent] = {}
+        # (id, name, expertise) of each agent the indexes and weights were
+        # last built from
+        self._index_signature: Tuple[Tuple[int, str, float], ...] = ()
+        # Voting weight of each agent in self.agents order
+        self._agent_weights: np.ndarray = np.empty(0, dtype=np.float64)
+        # LRU of execute_task results keyed on an input fingerprint
+        self._execution_cache: "OrderedDict[str, TaskResult]" = OrderedDict()
+        # Running compliance counters, updated as tasks are recorded
+        self._stats: Dict[str, int] = {"tasks": 0, "critical": 0, "interventions": 0}
+        # Cached get_agent_performance_summary frame; None means rebuild
+        self._perf_df: Optional["pd.DataFrame"] = None
         self.coordination_history: List[CoordinationDecision] = []
-        self.task_history: List[Dict] = []
+        self.task_history: Deque[TaskResult] = deque(maxlen=history_cap)
+        self._archiver = archiver
         
         # Configuration thresholds
         self.confidence_threshold = self._get_confidence_threshold()
@@ -183,57 +279,226 @@ class CoHumAInFramework:
         return {
             "confidence_min": self.confidence_threshold,
             "risk_max": 0.3,
-            "violation_tolerance": 0
+            "violation_tolerance": 0,
+            "delegation_cap": 3
         }
     
     def add_agent(self, agent: Agent):
-        """Add agent to the framework"""
+        """
+        Add agent to the framework
+        
+        Delegation lookups use an index that snapshots each agent's
+        expertise here; it is rebuilt on the next lookup if ``self.agents``
+        or an agent's expertise changed since.
+        """
         self.agents.append(agent)
+        self._index_agent(agent)
+        self._rebuild_agent_weights()
+        self._index_signature = self._roster_signature()
+        self._perf_df = None
     
     def add_agents(self, agents: List[Agent]):
         """Add multiple agents to the framework"""
         self.agents.extend(agents)
+        for agent in agents:
+            self._index_agent(agent)
+        self._rebuild_agent_weights()
+        self._index_signature = self._roster_signature()
+        self._perf_df = None
+    
+    def reindex_agents(self):
+        """Rebuild the agent lookup indexes from ``self.agents``"""
+        self._agent_index = {}
+        self._agents_by_expertise = []
+        self._expertise_keys = []
+        for agent in self.agents:
+            self._index_agent(agent)
+        self._rebuild_agent_weights()
+        self._index_signature = self._roster_signature()
+        self._perf_df = None
+    
+    def _roster_signature(self) -> Tuple[Tuple[int, str, float], ...]:
+        """Identity, name and expertise of each agent, in ``self.agents`` order"""
+        return tuple((id(agent), agent.name, agent.expertise) for agent in self.agents)
+    
+    def _ensure_indexed(self):
+        """Rebuild indexes and weights if ``self.agents`` or an agent changed since the last build"""
+        if self._roster_signature() != self._index_signature:
+            self.reindex_agents()
+    
+    def _index_agent(self, agent: Agent):
+        """Insert agent into the name lookup and expertise-ordered delegation index"""
+        self._agent_index.setdefault(agent.name, agent)
+        i = bisect.bisect_right(self._expertise_keys, -agent.expertise)
+        self._expertise_keys.insert(i, -agent.expertise)
+        self._agents_by_expertise.insert(i, agent)
+    
+    def _rebuild_agent_weights(self):
+        """Refresh the per-agent voting weights used for trust calibration"""
+        self._agent_weights = np.fromiter(
+            (self._agent_index[a.name].expertise for a in self.agents),
+            dtype=np.float64, count=len(self.agents)
+        )
     
     def execute_task(
         self,
         task: str,
         context: Optional[Dict] = None,
-        human_in_loop: bool = False
-    ) -> Dict[str, Any]:
+        human_in_loop: bool = False,
+        executor: Optional[Executor] = None,
+        cache_result: bool = False
+    ) -> TaskResult:
         """
         Execute a task with full CoHumAIn transparency
         
+        If an executor is given, agents produce their Level 1 reasoning
+        concurrently on it; results keep the order of ``self.agents``.
+        
+        With ``cache_result=True``, a repeat of the same task, context and
+        agent roster returns the earlier result (marked ``from_cache``)
+        instead of re-running the agents. Only use it for idempotent tasks;
+        contexts that are not plain JSON data are never cached.
+        
         Returns complete explanation package with all three levels
         """
         if context is None:
             context = {}
         
+        key = self._execution_fingerprint(task, context, human_in_loop) if cache_result else None
+        if key is not None:
+            cached = self._execution_cache.get(key)
+            if cached is not None:
+                self._execution_cache.move_to_end(key)
+                result = replace(cached, from_cache=True)
+                self._record_result(result)
+                return result
+        
         start_time = time.time()
+        # One timestamp for every explanation produced by this task
+        timestamp = datetime.now().isoformat()
         
         # Step 1: Generate individual agent reasoning (Level 1)
-        level1_explanations = []
-        for agent in self.agents:
-            reasoning = agent.generate_reasoning_trace(task, context)
-            level1_explanations.append(reasoning)
+        if executor is not None:
+            level1_explanations = list(executor.map(
+                lambda agent: agent.generate_reasoning_trace(task, context, timestamp=timestamp),
+                self.agents
+            ))
+        else:
+            level1_explanations = []
+            for agent in self.agents:
+                reasoning = agent.generate_reasoning_trace(task, context, timestamp=timestamp)
+                level1_explanations.append(reasoning)
+        
+        result = self._complete_task(
+            task, context, human_in_loop, level1_explanations, start_time, timestamp
+        )
+        
+        if key is not None:
+            self._execution_cache[key] = result
+            if len(self._execution_cache) > EXECUTION_CACHE_SIZE:
+                self._execution_cache.popitem(last=False)
+        return result
+    
+    def _execution_fingerprint(
+        self, task: str, context: Dict, human_in_loop: bool
+    ) -> Optional[str]:
+        """
+        Stable digest of everything that determines an execute_task result
+        
+        Returns None when the context is not plain JSON data: falling back
+        to ``str()`` would let distinct objects with equal reprs (e.g.
+        truncated NumPy arrays) share a cache entry.
+        """
+        try:
+            payload = json.dumps({
+                "task": task,
+                "context": context,
+                "human_in_loop": human_in_loop,
+                "agents": [
+                    (a.name, a.role, a.expertise, list(a.constitutional_principles))
+                    for a in self.agents
+                ],
+                "mode": self.safety_mode,
+            }, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    async def execute_task_async(
+        self,
+        task: str,
+        context: Optional[Dict] = None,
+        human_in_loop: bool = False,
+        max_concurrency: Optional[int] = None
+    ) -> TaskResult:
+        """
+        Execute a task, gathering Level 1 reasoning from all agents concurrently
+        
+        ``max_concurrency`` caps how many agents reason at once, e.g. to stay
+        within an LLM backend's rate limit. From synchronous code use
+        ``asyncio.run(framework.execute_task_async(...))``.
+        
+        Returns the same explanation package as ``execute_task``
+        """
+        if context is None:
+            context = {}
+        
+        start_time = time.time()
+        timestamp = datetime.now().isoformat()
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        
+        async def trace(agent: Agent) -> Dict[str, Any]:
+            if semaphore is None:
+                return await agent.generate_reasoning_trace_async(
+                    task, context, timestamp=timestamp
+                )
+            async with semaphore:
+                return await agent.generate_reasoning_trace_async(
+                    task, context, timestamp=timestamp
+                )
+        
+        # Step 1: Generate individual agent reasoning (Level 1)
+        level1_explanations = list(
+            await asyncio.gather(*(trace(agent) for agent in self.agents))
+        )
+        
+        return self._complete_task(
+            task, context, human_in_loop, level1_explanations, start_time, timestamp
+        )
+    
+    def _complete_task(
+        self,
+        task: str,
+        context: Dict,
+        human_in_loop: bool,
+        level1_explanations: List[Dict],
+        start_time: float,
+        timestamp: str
+    ) -> TaskResult:
+        """Run coordination, safety and trust steps on Level 1 output and record the result"""
+        aggregate = self._aggregate_level1(level1_explanations)
         
         # Step 2: Generate coordination explanations (Level 2)
-        level2_explanations = self._generate_coordination_explanations(
-            task, level1_explanations, context
+        level2_explanations, excessive_delegation = self._generate_coordination_explanations(
+            task, aggregate, context, timestamp
         )
+        level2_by_type: Dict[str, List[CoordinationDecision]] = {}
+        for decision in level2_explanations:
+            level2_by_type.setdefault(decision.decision_type, []).append(decision)
         
         # Step 3: Safety-aware attribution
         safety_assessment = self._assess_safety(
-            level1_explanations, level2_explanations
+            aggregate, level2_explanations, excessive_delegation
         )
         
         # Step 4: Determine automation level
         automation_level = self._calibrate_trust(
-            level1_explanations, safety_assessment, context
+            aggregate, safety_assessment, context
         )
         
         # Step 5: Generate collective explanation (Level 3)
         level3_explanation = self._generate_collective_explanation(
-            task, level1_explanations, level2_explanations, safety_assessment
+            task, aggregate, level2_explanations, safety_assessment, timestamp
         )
         
         # Step 6: Check if intervention required
@@ -245,107 +510,265 @@ class CoHumAInFramework:
         
         execution_time = time.time() - start_time
         
-        result = {
-            "task": task,
-            "success": safety_assessment.status != SafetyStatus.CRITICAL,
-            "level1_explanations": level1_explanations,
-            "level2_explanations": level2_explanations,
-            "level3_explanation": level3_explanation,
-            "safety_assessment": safety_assessment,
-            "automation_level": automation_level.value,
-            "requires_human_review": requires_intervention,
-            "intervention_reason": safety_assessment.intervention_reason,
-            "execution_time": execution_time,
-            "timestamp": datetime.now().isoformat()
-        }
+        result = TaskResult(
+            task=task,
+            success=safety_assessment.status != SafetyStatus.CRITICAL,
+            level1_explanations=level1_explanations,
+            level2_explanations=level2_explanations,
+            level2_by_type=level2_by_type,
+            level3_explanation=level3_explanation,
+            safety_assessment=safety_assessment,
+            automation_level=automation_level.value,
+            requires_human_review=requires_intervention,
+            intervention_reason=safety_assessment.intervention_reason,
+            execution_time=execution_time,
+            timestamp=timestamp
+        )
         
-        self.task_history.append(result)
+        self._record_result(result)
         return result
     
+    def _aggregate_level1(self, level1_explanations: List[Dict]) -> Level1Aggregate:
+        """Walk the Level 1 explanations once, collecting what later steps read"""
+        self._ensure_indexed()
+        confidences = []
+        violations = []
+        timeline = []
+        candidates = []
+        lo = hi = level1_explanations[0]["confidence"] if level1_explanations else 0.0
+        
+        for i, explanation in enumerate(level1_explanations):
+            confidence = explanation["confidence"]
+            confidences.append(confidence)
+            if confidence < lo:
+                lo = confidence
+            elif confidence > hi:
+                hi = confidence
+            
+            principle_check = explanation.get("constitutional_check", {})
+            if not principle_check.get("all_satisfied", True):
+                violations.append({
+                    "agent": explanation["agent"],
+                    "violations": principle_check.get("violations", [])
+                })
+            
+            timeline.append({
+                "step": i + 1,
+                "agent": explanation["agent"],
+                "action": explanation["action"],
+                "confidence": confidence
+            })
+            
+            if confidence < self.confidence_threshold:
+                candidates.append(explanation)
+        
+        # Explanations come one per agent in roster order, so the cached
+        # weights line up; otherwise look each agent up by name
+        if len(level1_explanations) == len(self._agent_weights):
+            weights = self._agent_weights
+        else:
+            weights = np.fromiter(
+                (self._get_agent_weight(e["agent"]) for e in level1_explanations),
+                dtype=np.float64, count=len(level1_explanations)
+            )
+        
+        return Level1Aggregate(
+            confidences=np.array(confidences, dtype=np.float64),
+            weights=weights,
+            confidence_spread=hi - lo,
+            violations=violations,
+            timeline=timeline,
+            delegation_candidates=candidates
+        )
+    
+    def _record_result(self, result: TaskResult):
+        """Append a task result to history and update the compliance counters"""
+        history = self.task_history
+        if self._archiver is not None and history and len(history) == history.maxlen:
+            self._archiver(history[0])
+        history.append(result)
+        self._stats["tasks"] += 1
+        if result.safety_assessment.status == SafetyStatus.CRITICAL:
+            self._stats["critical"] += 1
+        if result.requires_human_review:
+            self._stats["interventions"] += 1
+        self._perf_df = None
+    
     def _generate_coordination_explanations(
         self,
         task: str,
-        level1_explanations: List[Dict],
-        context: Dict
-    ) -> List[CoordinationDecision]:
+        aggregate: Level1Aggregate,
+        context: Dict,
+        timestamp: Optional[str] = None
+    ) -> Tuple[List[CoordinationDecision], bool]:
         """
         Generate Level 2 (Coordination) explanations
         NOVEL CONTRIBUTION: Makes delegation and conflict resolution transparent
+        
+        Returns the decisions and whether delegations passed the cap.
         """
         coordination_explanations = []
+        delegation_cap = self.intervention_thresholds.get("delegation_cap", 3)
+        delegations = 0
+        excessive_delegation = False
+        
+        stamp = {"timestamp": timestamp} if timestamp else {}
+        shortlist, bids = (
+            self._delegate_shortlist(task, context)
+            if aggregate.delegation_candidates else ([], {})
+        )
         
-        # Determine which agents should handle subtasks
-        for i, explanation in enumerate(level1_explanations):
+        # Determine which low-confidence agents should hand off their subtasks
+        for explanation in aggregate.delegation_candidates:
             agent_name = explanation["agent"]
             
-            # Check if delegation needed
-            if explanation["confidence"] < self.confidence_threshold:
-                # Find best agent for delegation
-                target_agent = self._find_best_delegate(task, explanation["agent"])
+            # Find best agent for delegation; only search the full roster if
+            # every shortlisted agent shares this agent's name
+            target_agent = next((a for a in shortlist if a.name != agent_name), None)
+            if target_agent is None and len(shortlist) < len(self.agents):
+                target_agent = self._find_best_delegate(task, agent_name, context)
+            
+            if target_agent:
+                coordination = CoordinationDecision(
+                    decision_type="delegation",
+                    from_agent=agent_name,
+                    to_agent=target_agent.name,
+                    rationale=f"Agent {agent_name} confidence ({explanation['confidence']:.2f}) below threshold",
+                    delegation_reason=self._delegation_reason(
+                        target_agent, bids.get(id(target_agent)), task, context
+                    ),
+                    **stamp
+                )
+                coordination_explanations.append(coordination)
+                delegations += 1
                 
-                if target_agent:
-                    coordination = CoordinationDecision(
-                        decision_type="delegation",
-                        from_agent=agent_name,
-                        to_agent=target_agent.name,
-                        rationale=f"Agent {agent_name} confidence ({explanation['confidence']:.2f}) below threshold",
-                        delegation_reason=f"Agent {target_agent.name} has higher expertise ({target_agent.expertise:.2f})"
-                    )
-                    coordination_explanations.append(coordination)
+                # Past the cap the warning is certain; stop looking for delegates
+                if delegations > delegation_cap:
+                    excessive_delegation = True
+                    coordination_explanations.append(CoordinationDecision(
+                        decision_type="excessive_delegation",
+                        from_agent="System",
+                        to_agent=None,
+                        rationale=f"Delegations exceeded the cap of {delegation_cap}; remaining agents not reassigned",
+                        **stamp
+                    ))
+                    break
         
         # Check for agent disagreements
-        if len(level1_explanations) > 1:
-            confidences = [e["confidence"] for e in level1_explanations]
-            if max(confidences) - min(confidences) > 0.2:
+        if len(aggregate.confidences) > 1:
+            if aggregate.confidence_spread > 0.2:
                 coordination = CoordinationDecision(
                     decision_type="conflict_resolution",
                     from_agent="System",
                     to_agent=None,
                     rationale="Significant confidence variance detected among agents",
-                    conflict_resolution_strategy="Weighted voting by expertise"
+                    conflict_resolution_strategy="Weighted voting by expertise",
+                    **stamp
                 )
                 coordination_explanations.append(coordination)
         
-        return coordination_explanations
+        return coordination_explanations, excessive_delegation
     
-    def _find_best_delegate(self, task: str, current_agent: str) -> Optional[Agent]:
+    def _find_best_delegate(
+        self,
+        task: str,
+        current_agent: str,
+        context: Optional[Dict] = None
+    ) -> Optional[Agent]:
         """Find best agent to delegate task to"""
-        candidates = [a for a in self.agents if a.name != current_agent]
+        self._ensure_indexed()
+        if self.safety_mode in CONTRACT_NET_MODES:
+            candidates = [a for a in self._agents_by_expertise if a.name != current_agent]
+            return self._allocate_via_cnp(task, candidates, context or {})
+        
+        # Highest-expertise agent other than the current one
+        return next(
+            (a for a in self._agents_by_expertise if a.name != current_agent), None
+        )
+    
+    def _delegate_shortlist(
+        self, task: str, context: Dict
+    ) -> Tuple[List[Agent], Dict[int, Dict[str, float]]]:
+        """
+        Top delegates for a task, best first, with their bids keyed by id()
         
-        if not candidates:
-            return None
+        Bids do not depend on which agent is delegating, so they are
+        collected once per task rather than once per delegation. Outside
+        Contract-Net modes no bids are requested and the dict is empty.
+        """
+        self._ensure_indexed()
+        k = min(DELEGATE_SHORTLIST_SIZE, len(self._agents_by_expertise))
+        if self.safety_mode in CONTRACT_NET_MODES:
+            bids = {id(agent): agent.bid(task, context) for agent in self._agents_by_expertise}
+            # nlargest is stable, so ties still go to the more expert agent
+            shortlist = heapq.nlargest(
+                k, self._agents_by_expertise,
+                key=lambda agent: self._bid_score(bids[id(agent)])
+            )
+            return shortlist, bids
+        return self._agents_by_expertise[:k], {}
+    
+    @staticmethod
+    def _bid_score(bid: Dict[str, float]) -> float:
+        """Composite Contract-Net score for a bid"""
+        return bid["confidence"] - BID_TIME_PENALTY * bid["estimatedSeconds"]
+    
+    def _delegation_reason(
+        self,
+        agent: Agent,
+        bid: Optional[Dict[str, float]],
+        task: str,
+        context: Dict
+    ) -> str:
+        """Why ``agent`` was picked: its winning bid in Contract-Net modes, else its expertise"""
+        if self.safety_mode not in CONTRACT_NET_MODES:
+            return f"Agent {agent.name} has higher expertise ({agent.expertise:.2f})"
+        if bid is None:
+            # Only reached when the delegate came from outside the shortlist
+            bid = agent.bid(task, context)
+        return (
+            f"Agent {agent.name} won Contract-Net bidding ({self.safety_mode} mode): "
+            f"score {self._bid_score(bid):.2f} = confidence {bid['confidence']:.2f} "
+            f"- {BID_TIME_PENALTY} x {bid['estimatedSeconds']:.1f}s estimated"
+        )
+    
+    def _allocate_via_cnp(
+        self,
+        task: str,
+        candidates: List[Agent],
+        context: Dict
+    ) -> Optional[Agent]:
+        """
+        Award a task by Contract-Net bidding
         
-        # Sort by expertise
-        candidates.sort(key=lambda a: a.expertise, reverse=True)
-        return candidates[0]
+        Each candidate bids its confidence for this task and an estimated
+        duration; the best composite score wins. Candidates arrive in
+        expertise order, so ties go to the more expert agent.
+        """
+        best_agent, best_score = None, float("-inf")
+        for agent in candidates:
+            score = self._bid_score(agent.bid(task, context))
+            if score > best_score:
+                best_agent, best_score = agent, score
+        return best_agent
     
     def _assess_safety(
         self,
-        level1_explanations: List[Dict],
-        level2_explanations: List[CoordinationDecision]
+        aggregate: Level1Aggregate,
+        level2_explanations: List[CoordinationDecision],
+        excessive_delegation: bool = False
     ) -> SafetyAssessment:
         """
         Assess safety with multi-agent attribution
         Integrates safety monitoring with explainability
         """
-        violations = []
+        # Constitutional violations were collected with the Level 1 aggregate
+        violations = aggregate.violations
         coordination_issues = []
         emergent_risks = []
         
-        # Check constitutional violations
-        for explanation in level1_explanations:
-            principle_check = explanation.get("constitutional_check", {})
-            if not principle_check.get("all_satisfied", True):
-                violations.append({
-                    "agent": explanation["agent"],
-                    "violations": principle_check.get("violations", [])
-                })
-        
         # Check coordination issues
-        delegation_count = sum(
-            1 for c in level2_explanations if c.decision_type == "delegation"
-        )
-        if delegation_count > 3:
+        if excessive_delegation:
             coordination_issues.append("Excessive delegation detected")
         
         # Calculate responsibility scores
@@ -381,7 +804,7 @@ class CoHumAInFramework:
     
     def _calibrate_trust(
         self,
-        level1_explanations: List[Dict],
+        aggregate: Level1Aggregate,
         safety_assessment: SafetyAssessment,
         context: Dict
     ) -> AutomationLevel:
@@ -390,10 +813,12 @@ class CoHumAInFramework:
         Extends single-agent trust metrics to collective confidence
         """
         # Calculate collective confidence
-        confidences = [e["confidence"] for e in level1_explanations]
-        weights = [self._get_agent_weight(e["agent"]) for e in level1_explanations]
+        confidences = aggregate.confidences
+        weights = aggregate.weights
         
-        collective_confidence = sum(c * w for c, w in zip(confidences, weights)) / sum(weights)
+        # Python float division keeps ZeroDivisionError for an empty roster
+        # rather than silently producing NaN
+        collective_confidence = float(confidences @ weights) / float(weights.sum())
         
         # Get task stakes
         stakes = context.get("stakes", "medium")
@@ -408,15 +833,17 @@ class CoHumAInFramework:
     
     def _get_agent_weight(self, agent_name: str) -> float:
         """Get weight for agent in collective confidence calculation"""
-        agent = next((a for a in self.agents if a.name == agent_name), None)
+        self._ensure_indexed()
+        agent = self._agent_index.get(agent_name)
         return agent.expertise if agent else 0.5
     
     def _generate_collective_explanation(
         self,
         task: str,
-        level1_explanations: List[Dict],
+        aggregate: Level1Aggregate,
         level2_explanations: List[CoordinationDecision],
-        safety_assessment: SafetyAssessment
+        safety_assessment: SafetyAssessment,
+        timestamp: Optional[str] = None
     ) -> CollectiveExplanation:
         """
         Generate Level 3 (Collective) explanation
@@ -433,15 +860,8 @@ class CoHumAInFramework:
         if len(level2_explanations) > 2:
             emergent_behaviors.append("High coordination required")
         
-        # Build temporal timeline
-        timeline = []
-        for i, explanation in enumerate(level1_explanations):
-            timeline.append({
-                "step": i + 1,
-                "agent": explanation["agent"],
-                "action": explanation["action"],
-                "confidence": explanation["confidence"]
-            })
+        # Temporal timeline was built with the Level 1 aggregate
+        timeline = aggregate.timeline
         
         # Generate counterfactuals
         counterfactuals = [
@@ -450,8 +870,8 @@ class CoHumAInFramework:
         ]
         
         # Calculate collective confidence
-        confidences = [e["confidence"] for e in level1_explanations]
-        collective_confidence = sum(confidences) / len(confidences)
+        confidences = aggregate.confidences
+        collective_confidence = float(confidences.sum()) / len(confidences)
         
         # Generate recommendation
         if safety_assessment.status == SafetyStatus.SAFE:
@@ -468,7 +888,8 @@ class CoHumAInFramework:
             temporal_timeline=timeline,
             counterfactuals=counterfactuals,
             collective_confidence=collective_confidence,
-            recommendation=recommendation
+            recommendation=recommendation,
+            **({"timestamp": timestamp} if timestamp else {})
         )
     
     def generate_compliance_report(
@@ -491,36 +912,57 @@ class CoHumAInFramework:
                 }
                 for a in self.agents
             ],
-            "total_tasks": len(self.task_history),
-            "safety_incidents": sum(
-                1 for t in self.task_history
-                if isinstance(t.get("safety_assessment"), SafetyAssessment)
-                and t["safety_assessment"].status == SafetyStatus.CRITICAL
-            ),
-            "interventions_required": sum(
-                1 for t in self.task_history if t.get("requires_human_review", False)
-            ),
+            "total_tasks": self._stats["tasks"],
+            "safety_incidents": self._stats["critical"],
+            "interventions_required": self._stats["interventions"],
             "generated_at": datetime.now().isoformat()
         }
         
         if format == "json":
-            return json.dumps(report, indent=2)
+            if orjson is not None:
+                return orjson.dumps(
+                    report,
+                    default=_json_default,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode()
+            return json.dumps(report, indent=2, default=_json_default)
         else:
             # Placeholder for other formats
             return str(report)
     
-    def get_agent_performance_summary(self) -> pd.DataFrame:
-        """Get performance summary for all agents"""
+    def get_agent_performance_summary(
+        self, as_dict: bool = False
+    ) -> "Union[pd.DataFrame, List[Dict[str, Any]]]":
+        """
+        Get performance summary for all agents
         
-        data = []
-        for agent in self.agents:
-            data.append({
-                "Agent": agent.name,
-                "Role": agent.role,
-                "Expertise": agent.expertise,
-                "Tasks": agent.performance_metrics["tasks_completed"],
-                "Avg Confidence": agent.performance_metrics["avg_confidence"],
-                "Accuracy": agent.performance_metrics["accuracy"]
-            })
+        The frame is rebuilt only after the roster changes or a task runs;
+        callers receive a copy, so the cached frame is never mutated.
+        With ``as_dict=True`` the same rows come back as plain dicts and
+        pandas is never imported.
+        """
+        self._ensure_indexed()
+        if as_dict:
+            return [dict(zip(PERFORMANCE_COLUMNS, row)) for row in self._performance_rows()]
         
-        return pd.DataFrame(data)
+        if self._perf_df is None:
+            import pandas as pd
+            
+            self._perf_df = pd.DataFrame.from_records(
+                self._performance_rows(), columns=PERFORMANCE_COLUMNS
+            )
+        return self._perf_df.copy()
+    
+    def _performance_rows(self) -> List[Tuple[Any, ...]]:
+        """One PERFORMANCE_COLUMNS-ordered row per agent"""
+        return [
+            (
+                agent.name,
+                agent.role,
+                agent.expertise,
+                agent.performance_metrics["tasks_completed"],
+                agent.performance_metrics["avg_confidence"],
+                agent.performance_metrics["accuracy"]
+            )
+            for agent in self.agents
+        ]
@@ -1,2 +1,4 @@
 """CoHumAIn Human Interface layer"""
-from cohumain.framework import AutomationLevel
+from cohumain.types import AutomationLevel
+
+__all__ = ["AutomationLevel"]
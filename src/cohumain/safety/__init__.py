@@ -1,2 +1,4 @@
 """CoHumAIn Safety layer"""
-from cohumain.framework import SafetyStatus, SafetyAssessment
+from cohumain.types import SafetyStatus, SafetyAssessment
+
+__all__ = ["SafetyStatus", "SafetyAssessment"]
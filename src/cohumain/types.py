@@ -0,0 +1,123 @@
+"""
+CoHumAIn Framework - Core Types
+Explanation, safety and result types shared across the framework
+
+Kept free of NumPy/pandas so enums and records can be imported cheaply.
+"""
+
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+import sys
+
+
+class ExplanationLevel(Enum):
+    """Three levels of explanation in CoHumAIn framework"""
+    INDIVIDUAL = 1  # Agent-level reasoning
+    COORDINATION = 2  # Inter-agent delegation and conflict resolution
+    COLLECTIVE = 3  # Team-level emergent behavior
+
+
+class AutomationLevel(Enum):
+    """Human oversight levels"""
+    IN_THE_LOOP = "in_loop"  # Human approves each decision
+    ON_THE_LOOP = "on_loop"  # Human monitors with intervention capability
+    OUT_OF_THE_LOOP = "out_loop"  # Autonomous with logging
+
+
+class SafetyStatus(Enum):
+    """Safety status indicators"""
+    SAFE = "safe"
+    WARNING = "warning"
+    CRITICAL = "critical"
+
+
+# dataclass(slots=True) needs Python 3.10+; on 3.9 instances keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class CoordinationDecision:
+    """Level 2 (Coordination) explanation"""
+    decision_type: str  # "delegation", "conflict_resolution", "information_sharing", "excessive_delegation"
+    from_agent: str
+    to_agent: Optional[str]
+    rationale: str
+    delegation_reason: Optional[str] = None
+    conflict_resolution_strategy: Optional[str] = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+@dataclass(frozen=True, **_SLOTS)
+class CollectiveExplanation:
+    """Level 3 (Collective) explanation"""
+    task: str
+    agent_contributions: Dict[str, float]
+    emergent_behaviors: List[str]
+    temporal_timeline: List[Dict]
+    counterfactuals: List[str]
+    collective_confidence: float
+    recommendation: str
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+@dataclass(frozen=True, **_SLOTS)
+class SafetyAssessment:
+    """Safety-aware attribution results"""
+    status: SafetyStatus
+    constitutional_violations: List[Dict]
+    coordination_issues: List[str]
+    emergent_risks: List[str]
+    responsible_agents: Dict[str, float]  # Agent name -> responsibility score
+    intervention_required: bool
+    intervention_reason: Optional[str] = None
+
+
+@dataclass(frozen=True, **_SLOTS)
+class TaskResult:
+    """Complete explanation package for one executed task"""
+    task: str
+    success: bool
+    level1_explanations: List[Dict]
+    level2_explanations: List[CoordinationDecision]
+    level2_by_type: Dict[str, List[CoordinationDecision]]  # decision_type -> decisions
+    level3_explanation: CollectiveExplanation
+    safety_assessment: SafetyAssessment
+    automation_level: str
+    requires_human_review: bool
+    intervention_reason: Optional[str]
+    execution_time: float
+    timestamp: str
+    from_cache: bool = False
+    
+    def __getitem__(self, key: str) -> Any:
+        """Mapping-style access, kept for callers written against the old dict result"""
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.__dataclass_fields__
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dataclass_fields__)
+    
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__dataclass_fields__ else default
+    
+    def keys(self):
+        return self.__dataclass_fields__.keys()
+    
+    def values(self) -> List[Any]:
+        return [getattr(self, name) for name in self.__dataclass_fields__]
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(name, getattr(self, name)) for name in self.__dataclass_fields__]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields; nested explanations are not converted"""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
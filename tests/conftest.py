@@ -0,0 +1,27 @@
+"""
+Shared pytest configuration for the CoHumAIn test suite
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Make the src/ layout importable without an installed package
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+
+@pytest.fixture(scope="session")
+def warm_framework():
+    """
+    Run one throwaway task per session so first-call costs don't land in a test
+
+    Opt-in via ``usefixtures`` rather than autouse: the framework is imported
+    here, not at module level, so ``pytest tests/test_types.py`` never loads it.
+    """
+    from cohumain.framework import Agent, CoHumAInFramework
+
+    fw = CoHumAInFramework()
+    fw.add_agent(Agent("Warmup", "Warmup", 0.9, 0.8, [], []))
+    fw.execute_task("warmup")
@@ -0,0 +1,69 @@
+"""
+Tests for the CoHumAIn result and explanation types
+
+Imports only ``cohumain.types``, so ``pytest tests/test_types.py`` runs
+without loading the framework or NumPy.
+"""
+
+import pytest
+
+from cohumain.types import (
+    ExplanationLevel,
+    AutomationLevel,
+    SafetyStatus,
+    CoordinationDecision,
+    SafetyAssessment,
+)
+
+
+# ---------------------------------------------------------------------------
+# Dataclass / enum tests
+# ---------------------------------------------------------------------------
+
+class TestEnums:
+    def test_explanation_levels(self):
+        assert ExplanationLevel.INDIVIDUAL.value == 1
+        assert ExplanationLevel.COORDINATION.value == 2
+        assert ExplanationLevel.COLLECTIVE.value == 3
+
+    def test_automation_levels(self):
+        assert AutomationLevel.IN_THE_LOOP.value == "in_loop"
+        assert AutomationLevel.ON_THE_LOOP.value == "on_loop"
+        assert AutomationLevel.OUT_OF_THE_LOOP.value == "out_loop"
+
+    def test_safety_status(self):
+        assert SafetyStatus.SAFE.value == "safe"
+        assert SafetyStatus.WARNING.value == "warning"
+        assert SafetyStatus.CRITICAL.value == "critical"
+
+
+class TestCoordinationDecision:
+    def test_creation(self):
+        cd = CoordinationDecision(
+            decision_type="delegation",
+            from_agent="A",
+            to_agent="B",
+            rationale="A is busy",
+        )
+        assert cd.decision_type == "delegation"
+        assert cd.from_agent == "A"
+        assert cd.to_agent == "B"
+        assert cd.timestamp  # auto-generated
+
+
+class TestSafetyAssessment:
+    def test_creation(self):
+        sa = SafetyAssessment(
+            status=SafetyStatus.SAFE,
+            constitutional_violations=[],
+            coordination_issues=[],
+            emergent_risks=[],
+            responsible_agents={"A": 0.5, "B": 0.5},
+            intervention_required=False,
+        )
+        assert sa.status == SafetyStatus.SAFE
+        assert sa.intervention_required is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])